@@ -0,0 +1,291 @@
+# api_load.py
+# ASYNCIO LOAD GENERATOR FOR THE BACKEND API (backend/routes/api.js)
+# test_api.js and quick_check.js send one request at a time; this replays a mix of
+# passenger and TTE traffic built from a generated manifest at a target rate, so the
+# throughput ceiling of a local backend shows up before a release.
+#
+# Requests are scheduled open-loop (one every 1/QPS seconds, or Poisson arrivals with
+# --poisson) and latency is measured from the scheduled send time, so a backend that
+# falls behind shows it as latency instead of silently lowering the offered rate.
+# Connections are plain HTTP/1.1 keep-alive streams from a fixed pool (stdlib only).
+#
+# Traffic mix (--mix name=weight,...):
+#   pnr      GET  /passenger/pnr/:pnr, /passenger/search/:pnr
+#   tte      POST /tte/mark-boarded, /tte/mark-no-show (staff token), GET /tte/boarded-rac-passengers,
+#            GET  /train/vacant-berths
+#   advance  POST /train/next-station
+#
+# The backend must be running with the train initialized and the journey started.
+# TTE traffic logs in as --staff-id first (password from --password or API_LOAD_PASSWORD);
+# the run stops if that login fails, so latencies never measure auth rejections.
+# Usage:
+#   API_LOAD_PASSWORD=... python api_load.py --qps 200 --duration 30
+#   python api_load.py --manifest amaravati_correct_allocation.json --qps 500 --mix pnr=0.9,tte=0.1 \
+#       --output load_results.json
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from mongo_loader import iter_documents
+
+DEFAULT_MIX = {"pnr": 0.75, "tte": 0.245, "advance": 0.005}
+
+
+# ----------------------------
+# HTTP/1.1 KEEP-ALIVE CLIENT
+# ----------------------------
+class ConnectionPool:
+    def __init__(self, base_url, size):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.idle = asyncio.Queue()
+        for _ in range(size):
+            self.idle.put_nowait(None)  # opened lazily
+
+    async def request(self, method, path, body=None, headers=None):
+        """(status, parsed JSON body or None); raises OSError / asyncio errors on transport failure"""
+        conn = await self.idle.get()
+        try:
+            if conn is None:
+                conn = await asyncio.open_connection(self.host, self.port)
+            reader, writer = conn
+            payload = json.dumps(body).encode() if body is not None else b""
+            lines = [f"{method} {self.prefix}{path} HTTP/1.1", f"Host: {self.host}:{self.port}",
+                     "Connection: keep-alive", f"Content-Length: {len(payload)}"]
+            if body is not None:
+                lines.append("Content-Type: application/json")
+            lines.extend(f"{k}: {v}" for k, v in (headers or {}).items())
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + payload)
+            await writer.drain()
+            status, data, keep_alive = await self._read_response(reader)
+            if not keep_alive:
+                writer.close()
+                conn = None
+            return status, data
+        except BaseException:
+            if conn is not None:
+                conn[1].close()
+            conn = None
+            raise
+        finally:
+            self.idle.put_nowait(conn)
+
+    async def _read_response(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by server")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            raw = b"".join(chunks)
+        else:
+            raw = await reader.readexactly(int(headers.get("content-length", 0)))
+        try:
+            data = json.loads(raw) if raw else None
+        except ValueError:
+            data = None
+        return status, data, headers.get("connection", "").lower() != "close"
+
+    async def close(self):
+        while not self.idle.empty():
+            conn = self.idle.get_nowait()
+            if conn is not None:
+                conn[1].close()
+
+
+# ----------------------------
+# TRAFFIC
+# ----------------------------
+class Traffic:
+    def __init__(self, passengers, mix, rng, token=None):
+        self.pnrs = [p["PNR_Number"] for p in passengers]
+        self.mix_names = list(mix)
+        self.mix_weights = list(mix.values())
+        self.rng = rng
+        self.auth = {"Authorization": f"Bearer {token}"} if token else {}
+
+    def next_request(self):
+        """(endpoint label, method, path, body, headers)"""
+        kind = self.rng.choices(self.mix_names, self.mix_weights)[0]
+        pnr = self.rng.choice(self.pnrs)
+        if kind == "pnr":
+            if self.rng.random() < 0.5:
+                return "GET /passenger/pnr/:pnr", "GET", f"/passenger/pnr/{pnr}", None, None
+            return "GET /passenger/search/:pnr", "GET", f"/passenger/search/{pnr}", None, None
+        if kind == "tte":
+            action = self.rng.randrange(4)
+            if action == 0:
+                return "POST /tte/mark-boarded", "POST", "/tte/mark-boarded", {"pnr": pnr}, None
+            if action == 1:
+                return "POST /tte/mark-no-show", "POST", "/tte/mark-no-show", {"pnr": pnr}, self.auth
+            if action == 2:
+                return "GET /tte/boarded-rac-passengers", "GET", "/tte/boarded-rac-passengers", None, None
+            return "GET /train/vacant-berths", "GET", "/train/vacant-berths", None, None
+        if kind == "advance":
+            return "POST /train/next-station", "POST", "/train/next-station", {}, None
+        raise ValueError(f"Unknown traffic kind: {kind}")
+
+
+class LoginError(RuntimeError):
+    pass
+
+
+async def login(pool, staff_id, password):
+    """Staff JWT from /auth/staff/login (backend/controllers/authController.js); raises LoginError"""
+    try:
+        status, data = await pool.request("POST", "/auth/staff/login", {"employeeId": staff_id, "password": password})
+    except (OSError, asyncio.IncompleteReadError) as e:
+        raise LoginError(f"Staff login as {staff_id} failed: {type(e).__name__}: {e}") from e
+    if status != 200 or not data or not data.get("token"):
+        message = data.get("message") if isinstance(data, dict) else None
+        raise LoginError(f"Staff login as {staff_id} failed (HTTP {status}{': ' + message if message else ''})")
+    return data["token"]
+
+
+async def run_load(base_url, passengers, qps, duration, mix, connections, seed=0, poisson=False,
+                   staff_id=None, password=None):
+    """Drive the backend for duration seconds; returns {endpoint: stats dict} (LoginError if TTE login fails)"""
+    pool = ConnectionPool(base_url, connections)
+    rng = random.Random(seed)
+    token = None
+    if mix.get("tte"):
+        if not staff_id or not password:
+            raise ValueError("tte traffic needs staff_id and password (mark-no-show requires a staff token)")
+        try:
+            token = await login(pool, staff_id, password)
+        except LoginError:
+            await pool.close()
+            raise
+    traffic = Traffic(passengers, mix, rng, token)
+
+    samples = {}  # endpoint -> [latency ms, ...]
+    errors = {}  # endpoint -> {reason: count}
+
+    async def fire(scheduled, label, method, path, body, headers):
+        reason = None
+        try:
+            status, _ = await pool.request(method, path, body, headers)
+            if status >= 400:
+                reason = f"HTTP {status}"
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            reason = type(e).__name__
+        samples.setdefault(label, []).append((time.perf_counter() - scheduled) * 1000)
+        if reason:
+            endpoint_errors = errors.setdefault(label, {})
+            endpoint_errors[reason] = endpoint_errors.get(reason, 0) + 1
+
+    tasks = set()
+    started = time.perf_counter()
+    scheduled = started
+    while scheduled - started < duration:
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(fire(scheduled, *traffic.next_request()))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        scheduled += rng.expovariate(qps) if poisson else 1 / qps
+    if tasks:
+        await asyncio.wait(tasks)
+    elapsed = time.perf_counter() - started
+    await pool.close()
+
+    results = {}
+    for label, latencies in sorted(samples.items()):
+        failed = sum(errors.get(label, {}).values())
+        p50, p95, p99 = np.percentile(latencies, (50, 95, 99)).tolist()
+        results[label] = {
+            'requests': len(latencies),
+            'achieved_qps': len(latencies) / elapsed,
+            'p50_ms': p50,
+            'p95_ms': p95,
+            'p99_ms': p99,
+            'max_ms': max(latencies),
+            'error_rate': failed / len(latencies),
+            'errors': errors.get(label, {})
+        }
+    return results
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown traffic kind '{name}' (expected one of {', '.join(DEFAULT_MIX)})")
+        mix[name] = float(weight)
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay passenger / TTE traffic against the backend API")
+    parser.add_argument("--base-url", default="http://localhost:5000/api")
+    parser.add_argument("--manifest", help="exported .json / .ndjson manifest (default: generate one in-process)")
+    parser.add_argument("--algorithm", default="correct", help="allocator when generating the manifest")
+    parser.add_argument("--qps", type=float, default=100)
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="e.g. pnr=0.75,tte=0.245,advance=0.005")
+    parser.add_argument("--poisson", action="store_true", help="Poisson arrivals instead of a fixed interval")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--staff-id", default="ADMIN_01")
+    parser.add_argument("--password", default=os.environ.get("API_LOAD_PASSWORD"),
+                        help="staff password (default: $API_LOAD_PASSWORD); required for tte traffic")
+    parser.add_argument("--output", help="write the per-endpoint results as JSON")
+    args = parser.parse_args(argv)
+    if args.mix.get("tte") and not args.password:
+        parser.error("tte traffic needs a staff login: pass --password or set API_LOAD_PASSWORD")
+
+    if args.manifest:
+        passengers = list(iter_documents(args.manifest))
+    else:
+        from passenger_generator import generate
+        passengers = list(generate({"algorithm": args.algorithm}).records())
+    print(f"🚀 {args.qps:g} QPS for {args.duration:g}s against {args.base_url} "
+          f"({len(passengers)} passengers, {args.connections} connections)")
+
+    try:
+        results = asyncio.run(run_load(args.base_url, passengers, args.qps, args.duration, args.mix,
+                                       args.connections, args.seed, args.poisson, args.staff_id, args.password))
+    except LoginError as e:
+        print(f"❌ {e}; not starting the load run")
+        return 1
+
+    print(f"\n{'Endpoint':<36} {'Req':>7} {'QPS':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'Errors':>7}")
+    for label, stats in results.items():
+        print(f"{label:<36} {stats['requests']:>7} {stats['achieved_qps']:>8.1f} {stats['p50_ms']:>8.1f} "
+              f"{stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f} {stats['error_rate']:>7.1%}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"qps": args.qps, "duration": args.duration, "mix": args.mix, "results": results}, f, indent=2)
+        print(f"\n✅ Results: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
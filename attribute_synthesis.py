@@ -0,0 +1,83 @@
+# attribute_synthesis.py
+# BULK PASSENGER ATTRIBUTE SYNTHESIS
+# Allocation only decides seats: status, class, journey, coach/berth. Everything that
+# identifies a passenger (IRCTC ID, PNR, name, age, gender, mobile, email) is drawn
+# afterwards for a chunk of allocated rows at once: ages and genders from seeded
+# numpy.random.Generators, names and mobiles from the permutation generators in
+# identity_generators.py, IRCTC IDs and PNRs as ranges, so the whole enrichment is a
+# few array operations instead of several RNG calls per passenger inside the
+# allocation loops.
+#
+# fill() only handles rows that have no identity yet, so the generators call it after
+# every FILL_CHUNK allocated rows and the streaming sinks (manifest_exporters.py) get
+# records while allocation is still running. Every stream is split-invariant: ages and
+# genders come from their own generators, one float64 per row, so the identities of a
+# row do not depend on how the fills were chunked (a cached phase fills in one go).
+# With a CounterRNG (counter_rng.py) ages and genders are keyed by the row's position
+# instead of drawn in sequence, like names and mobiles already are.
+
+import numpy as np
+
+from identity_generators import UniqueMobiles, UniqueNames, derive_key
+from passenger_table import GENDERS
+
+FILL_CHUNK = 200  # rows allocated between two fills during generation
+
+
+def email_for(name):
+    """Gmail address derived from a (unique) passenger name"""
+    return f"{name.lower().replace(' ', '.').replace(chr(39), '')}@gmail.com"
+
+
+class AttributeSynthesizer:
+    def __init__(self, seed, first_names, middle, last, first_irctc=1, first_pnr=1000000001,
+                 min_age=18, max_age=77, keyed=None):
+        self.age_rng = np.random.default_rng(derive_key(seed, "ages"))
+        self.gender_rng = np.random.default_rng(derive_key(seed, "genders"))
+        self.keyed = keyed
+        self.names = UniqueNames(first_names, middle, last, seed)
+        self.mobiles = UniqueMobiles(seed)
+        self.next_irctc = first_irctc
+        self.next_pnr = first_pnr
+        self.min_age = min_age
+        self.max_age = max_age
+        self.filled = 0  # rows given an identity (one age and one gender draw each)
+
+    def fill(self, table, at_least=1):
+        """Give the rows of table without an identity one, once at least at_least are waiting; returns how many"""
+        count = table.pending_identities()
+        if count == 0 or count < at_least:
+            return 0
+        names = self.names.take(count)
+        if self.keyed is not None:
+            slots = np.arange(self.filled, self.filled + count)
+            ages = self.keyed.integers("age", slots, self.min_age, self.max_age)
+            genders = self.keyed.integers("gender", slots, 0, len(GENDERS) - 1)
+        else:
+            # One float64 per row (never a buffered integer draw), so chunking cannot shift the streams
+            ages = self.min_age + (self.age_rng.random(count) * (self.max_age - self.min_age + 1)).astype(np.int64)
+            genders = (self.gender_rng.random(count) * len(GENDERS)).astype(np.int64)
+        table.add_identities(
+            irctc_seq=np.arange(self.next_irctc, self.next_irctc + count),
+            pnr=np.arange(self.next_pnr, self.next_pnr + count, dtype=np.int64),
+            names=names,
+            ages=ages,
+            genders=genders,
+            mobiles=self.mobiles.take(count),
+            emails=[email_for(name) for name in names]
+        )
+        self.next_irctc += count
+        self.next_pnr += count
+        self.filled += count
+        return count
+
+    def draws(self):
+        """RNG draws spent so far, per identity stream"""
+        return {
+            'names': self.names.drawn,
+            'name_permutation_evals': self.names.order.encryptions,
+            'mobiles': self.mobiles.drawn,
+            'mobile_permutation_evals': self.mobiles.order.encryptions,
+            'ages': self.filled,
+            'genders': self.filled
+        }
@@ -0,0 +1,112 @@
+# batch_generate.py
+# PARALLEL MULTI-TRAIN, MULTI-DATE DATASET GENERATION
+# Runs one allocator (passenger_generator "correct" or "optimized") per (train, journey
+# date) shard across a process pool. Every shard gets its own seed derived from the base
+# seed, the train number and the journey date (SHA-256, not Python's randomised
+# hash()), and shards are written back in (train, date) order, so the combined
+# NDJSON output is byte-identical whatever the worker count.
+# Shard i numbers its passengers from PNR 1000000001 + i * SHARD_ID_STRIDE (IRCTC IDs
+# likewise), so the combined file loads into one collection under the unique
+# PNR_Number index; main() checks that before reporting success.
+#
+# Usage:
+#   python batch_generate.py --trains 17225 17226 --start-date 15-11-2025 --days 90 --workers 8
+#   python batch_generate.py --algorithm optimized --trains 17225 --dates 15-11-2025 16-11-2025
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from passenger_generator import ALGORITHMS, generate
+
+BASE_SEED = 20251116
+SHARD_ID_STRIDE = 100_000  # PNR / IRCTC numbers reserved per shard
+
+
+def derive_seed(base_seed, train_number, journey_date):
+    """Deterministic per-shard seed (same on every machine and Python run)"""
+    digest = hashlib.sha256(f"{base_seed}:{train_number}:{journey_date}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def journey_dates(start_date, days):
+    """DD-MM-YYYY dates for `days` consecutive journeys starting at start_date"""
+    start = datetime.strptime(start_date, "%d-%m-%Y")
+    return [(start + timedelta(days=i)).strftime("%d-%m-%Y") for i in range(days)]
+
+
+def generate_shard(algorithm, train_number, journey_date, seed, id_offset=0):
+    """Generate one train-date in this worker; returns (NDJSON text, passenger count, PNRs, IRCTC sequences)"""
+    manifest = generate({"algorithm": algorithm, "train_number": train_number, "journey_date": journey_date,
+                         "id_offset": id_offset}, seed)
+    if len(manifest.passengers) > SHARD_ID_STRIDE:
+        raise ValueError(f"{train_number} {journey_date}: {len(manifest.passengers)} passengers overflow "
+                         f"the {SHARD_ID_STRIDE} PNRs reserved per shard")
+    lines = [json.dumps(record, ensure_ascii=False) + "\n" for record in manifest.records()]
+    return "".join(lines), len(lines), np.array(manifest.passengers.pnr), np.array(manifest.passengers.irctc_seq)
+
+
+def duplicates(arrays):
+    """Number of values that occur more than once across the arrays"""
+    values = np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.int64)
+    return int(values.size - np.unique(values).size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate manifests for N trains x M journey dates in parallel")
+    parser.add_argument("--algorithm", default="correct", choices=sorted(ALGORITHMS),
+                        help="correct (passengers_data.py rules) or optimized (test.py constraints)")
+    parser.add_argument("--trains", nargs="+", default=["17225"])
+    parser.add_argument("--dates", nargs="+", help="journey dates (DD-MM-YYYY)")
+    parser.add_argument("--start-date", default="15-11-2025", help="first journey date when --dates is not given")
+    parser.add_argument("--days", type=int, default=1, help="number of consecutive journey dates")
+    parser.add_argument("--seed", type=int, default=BASE_SEED)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--output", default="batch_manifest.ndjson")
+    args = parser.parse_args(argv)
+
+    dates = args.dates or journey_dates(args.start_date, args.days)
+    shards = [(train, date) for train in args.trains for date in dates]
+
+    print(f"🚂 Generating {len(shards)} shards ({len(args.trains)} trains × {len(dates)} dates) "
+          f"with the {args.algorithm} allocator on {args.workers} workers")
+    started = time.perf_counter()
+    total = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool, \
+            open(args.output, "w", encoding="utf-8", newline="\n") as out:
+        results = pool.map(
+            generate_shard,
+            [args.algorithm] * len(shards),
+            [train for train, _ in shards],
+            [date for _, date in shards],
+            [derive_seed(args.seed, train, date) for train, date in shards],
+            [i * SHARD_ID_STRIDE for i in range(len(shards))]
+        )
+        # map() yields in submission order, so the file layout never depends on scheduling
+        pnrs, irctc = [], []
+        for (train, date), (text, count, shard_pnrs, shard_irctc) in zip(shards, results):
+            out.write(text)
+            total += count
+            pnrs.append(shard_pnrs)
+            irctc.append(shard_irctc)
+            print(f"  ✅ {train} {date}: {count} passengers")
+
+    elapsed = time.perf_counter() - started
+    duplicate_pnrs, duplicate_irctc = duplicates(pnrs), duplicates(irctc)
+    if duplicate_pnrs or duplicate_irctc:
+        print(f"❌ {args.output}: {duplicate_pnrs} duplicate PNRs, {duplicate_irctc} duplicate IRCTC IDs")
+        return 1
+    print(f"✅ Wrote {total} passengers to {args.output} in {elapsed:.1f}s "
+          f"({len(shards) / elapsed:.1f} shards/s); all PNRs and IRCTC IDs unique")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
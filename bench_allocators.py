@@ -0,0 +1,218 @@
+# bench_allocators.py
+# ALLOCATOR BENCHMARK SUITE
+# Runs CorrectAllocator (passengers_data.py) and OptimizedAllocator (test.py) in-process
+# through passenger_generator.generate() over a
+# sweep of passenger demand, coach count, route length (station count) and the
+# short/medium/long journey mix. Each scenario is one parameter changed from the
+# default train. Scenarios run in a fresh process (so a warm cache or leftover heap
+# from one run never affects the next) and record:
+#   - wall time (best of --repeat runs after a warm-up run) and wall time per phase
+#     (the scripts' PHASE N banners)
+#   - peak traced memory (tracemalloc, measured in a separate run)
+#   - passengers, berth-segment utilisation per class and peak onboard
+#
+# Results go to a JSON file and a comparison table. With --baseline, any tracked
+# scenario more than --threshold slower than the baseline fails the run (exit 1).
+#
+# Usage:
+#   python bench_allocators.py --output bench_results.json
+#   python bench_allocators.py --baseline bench_results.json --threshold 0.15
+#   python bench_allocators.py --only test --repeat 5
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import re
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+# scenario prefix (the script each allocator runs behind) -> passenger_generator algorithm
+SCRIPTS = {"passengers_data": "correct", "test": "optimized"}
+
+# (name, config overrides, tracked) - tracked scenarios gate regressions against --baseline
+SWEEP = [
+    ("default", {}, True),
+    ("passengers_x0.5", {"passenger_scale": 0.5}, False),
+    ("passengers_x2", {"passenger_scale": 2}, True),
+    ("passengers_x4", {"passenger_scale": 4}, False),
+    ("coaches_5+1", {"sleeper_coaches": 5, "ac_coaches": 1}, False),
+    ("coaches_18+4", {"sleeper_coaches": 18, "ac_coaches": 4}, True),
+    ("stations_42", {"extra_stations": 14}, False),
+    ("stations_56", {"extra_stations": 28}, True),
+    ("cnf_interval", {"cnf_mode": "interval"}, True),
+    ("cnf_interval_x2", {"cnf_mode": "interval", "passenger_scale": 2}, False),
+]
+# The journey mix only exists in the optimized allocator's phase-2 fill
+MIX_SWEEP = [
+    ("mix_short", {"journey_mix": (0.70, 0.20, 0.10)}, False),
+    ("mix_long", {"journey_mix": (0.10, 0.20, 0.70)}, True),
+]
+SCENARIOS = (
+    [("passengers_data/" + name, "passengers_data", overrides, tracked) for name, overrides, tracked in SWEEP] +
+    [("test/" + name, "test", overrides, tracked) for name, overrides, tracked in SWEEP + MIX_SWEEP]
+)
+
+PHASE_LINE = re.compile(r"^(PHASE \d+)|^📊 (COMPREHENSIVE ANALYSIS)")
+
+
+class PhaseClock(io.TextIOBase):
+    """Stdout replacement that timestamps the generators' PHASE banners instead of printing"""
+
+    def __init__(self):
+        self.marks = [("setup", time.perf_counter())]
+        self.pending = ""
+
+    def write(self, text):
+        self.pending += text
+        while "\n" in self.pending:
+            line, self.pending = self.pending.split("\n", 1)
+            match = PHASE_LINE.match(line)
+            if match:
+                self.marks.append((match.group(1) or "ANALYSIS", time.perf_counter()))
+        return len(text)
+
+    def phases(self, finished):
+        ends = [t for _, t in self.marks[1:]] + [finished]
+        return {name: end - start for (name, start), end in zip(self.marks, ends)}
+
+
+def _run(algorithm, overrides):
+    """generate() + report() as the scripts run them, minus exports"""
+    from passenger_generator import DEFAULT_SEED, generate, report
+
+    clock = PhaseClock()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(clock):
+        manifest = generate({"algorithm": algorithm, **overrides}, DEFAULT_SEED, log=print)
+        report(manifest)
+    finished = time.perf_counter()
+    return manifest, finished - started, clock.phases(finished)
+
+
+def _summarise(manifest):
+    passengers = manifest.passengers
+    matrix = manifest.occupancy()
+    peak, _ = matrix.peak()
+    return {
+        "passengers": len(passengers),
+        "stations": len(passengers.station_names),
+        "berths": int(matrix.matrix.shape[0]),
+        "rac": passengers.count("PNR_Status", "RAC"),
+        "wl": passengers.count("PNR_Status", "WL"),
+        "peak_onboard": peak,
+        "utilisation": {cls: round(u, 4) for cls, u in matrix.class_utilisation().items()},
+    }
+
+
+def run_scenario(algorithm, overrides, repeat):
+    """Time one scenario in this (fresh) worker process; returns its result dict"""
+    _run(algorithm, overrides)  # warm-up: module imports and .pyc compilation are not timed
+    walls = []
+    for _ in range(repeat):
+        manifest, wall, phases = _run(algorithm, overrides)
+        if not walls or wall < min(walls):
+            best_phases = phases
+        walls.append(wall)
+    result = _summarise(manifest)
+
+    # tracemalloc slows allocation-heavy code several-fold, so memory gets its own run
+    tracemalloc.start()
+    _run(algorithm, overrides)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result.update({
+        "wall_s": min(walls),
+        "wall_runs_s": walls,
+        "phases_s": best_phases,
+        "peak_mem_mb": peak_bytes / 2**20,
+    })
+    return result
+
+
+def compare(results, baseline, threshold):
+    """Rows for the comparison table and the list of tracked regressions"""
+    base = {r["name"]: r for r in baseline["scenarios"]} if baseline else {}
+    rows, regressions = [], []
+    for r in results:
+        old = base.get(r["name"])
+        ratio = r["wall_s"] / old["wall_s"] if old else None
+        if ratio is not None and r["tracked"] and ratio > 1 + threshold:
+            regressions.append((r["name"], ratio))
+        rows.append((r, old, ratio))
+    return rows, regressions
+
+
+def print_table(rows, threshold):
+    print(f"{'scenario':32s} {'pax':>6s} {'wall s':>8s} {'base s':>8s} {'ratio':>7s} "
+          f"{'mem MB':>8s} {'SL util':>8s} {'AC util':>8s}")
+    print("-" * 92)
+    for r, old, ratio in rows:
+        flag = ""
+        if ratio is not None and ratio > 1 + threshold:
+            flag = " ❌" if r["tracked"] else " ⚠️"
+        util = r["utilisation"]
+        print(f"{r['name']:32s} {r['passengers']:6d} {r['wall_s']:8.3f} "
+              f"{old['wall_s'] if old else float('nan'):8.3f} "
+              f"{ratio if ratio is not None else float('nan'):7.2f} {r['peak_mem_mb']:8.1f} "
+              f"{util.get('Sleeper', 0) * 100:7.1f}% {util.get('AC_3_Tier', 0) * 100:7.1f}%{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark both allocators across train sizes and journey mixes")
+    parser.add_argument("--only", choices=sorted(SCRIPTS), help="benchmark one allocator only (by its script)")
+    parser.add_argument("--scenarios", nargs="+", help="scenario names to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per scenario (best is kept)")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="allowed slowdown of a tracked scenario vs the baseline (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+
+    scenarios = [
+        s for s in SCENARIOS
+        if (not args.only or s[1] == args.only) and (not args.scenarios or s[0] in args.scenarios)
+    ]
+    print(f"⏱️  Running {len(scenarios)} scenarios × {args.repeat} runs")
+    results = []
+    for name, key, overrides, tracked in scenarios:
+        # One process per scenario: max_tasks_per_child=1 guarantees nothing is reused
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn"), max_tasks_per_child=1) as pool:
+            result = pool.submit(run_scenario, SCRIPTS[key], overrides, args.repeat).result()
+        result.update({"name": name, "algorithm": SCRIPTS[key], "config": overrides, "tracked": tracked})
+        results.append(result)
+        phases = ", ".join(f"{p} {s:.3f}s" for p, s in result["phases_s"].items())
+        print(f"  ✅ {name}: {result['wall_s']:.3f}s ({phases})")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    rows, regressions = compare(results, baseline, args.threshold)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+            "scenarios": results
+        }, f, indent=2)
+    print(f"✅ Results: {args.output}\n")
+    print_table(rows, args.threshold)
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} tracked scenario(s) slower than baseline by more than "
+              f"{args.threshold:.0%}:")
+        for name, ratio in regressions:
+            print(f"  {name}: {ratio:.2f}x")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+# berth_index.py
+# FREE-BERTH LOOKUP INDEX: first-fit berth search without probing occupied berths
+# For every (class, berth type) group and every segment (station s -> s+1) we keep a
+# bitset of the berths that are still free on that segment. The berths free over a
+# whole journey [board, deboard) are the AND of those bitsets, and the first-fit berth
+# is the lowest set bit. Bits are numbered in coach order, then berth order, so the
+# lowest bit is exactly the berth the old nested coach/berth loop would have found.
+
+
+class FreeBerthIndex:
+    def __init__(self, num_segments, coaches_by_class, berth_maps):
+        """
+        num_segments: number of station-to-station segments (stations - 1)
+        coaches_by_class: {"Sleeper": ["S1", ...], "AC_3_Tier": ["B1", ...]}
+        berth_maps: {"Sleeper": sleeper_berths, "AC_3_Tier": ac_berths}
+        """
+        self.num_segments = num_segments
+        self.coaches_by_class = coaches_by_class
+        self.group_berths = {}  # (class, berth_type) -> [(coach, berth)] in bit order
+        self.group_free = {}  # (class, berth_type) -> [free bitset per segment]
+        self.berth_bits = {}  # (coach, berth) -> (class, berth_type, bit)
+        self.coach_rank = {}  # coach -> position within its class
+        self.lookups = 0  # first_free calls, i.e. (class, berth type) groups probed
+
+        for coach_class, coaches in coaches_by_class.items():
+            for rank, coach in enumerate(coaches):
+                self.coach_rank[coach] = rank
+            for berth_type, berth_numbers in berth_maps[coach_class].items():
+                group = (coach_class, berth_type)
+                berths = [(coach, berth) for coach in coaches for berth in berth_numbers]
+                for bit, key in enumerate(berths):
+                    self.berth_bits[key] = (coach_class, berth_type, bit)
+                self.group_berths[group] = berths
+                self.group_free[group] = [(1 << len(berths)) - 1] * num_segments
+
+    def _free_over(self, group, start, end):
+        """Bitset of berths in the group that are free on every segment in [start, end)"""
+        free_per_segment = self.group_free[group]
+        free = free_per_segment[start]
+        for segment in range(start + 1, end):
+            free &= free_per_segment[segment]
+            if not free:
+                break
+        return free
+
+    def first_free(self, coach_class, berth_type, start, end):
+        """First (coach, berth) of this class and type free over [start, end), or None"""
+        group = (coach_class, berth_type)
+        self.lookups += 1
+        free = self._free_over(group, start, end)
+        if not free:
+            return None
+        return self.group_berths[group][(free & -free).bit_length() - 1]
+
+    def first_free_in_class(self, coach_class, berth_types, start, end):
+        """
+        First-fit over a class in the same order as the nested allocation loops:
+        coach by coach, and within a coach the berth types in preference order.
+        Returns (coach, berth, berth_type) or None.
+        """
+        best = None
+        best_rank = None
+        for type_rank, berth_type in enumerate(berth_types):
+            hit = self.first_free(coach_class, berth_type, start, end)
+            if hit is None:
+                continue
+            rank = (self.coach_rank[hit[0]], type_rank)
+            if best_rank is None or rank < best_rank:
+                best = (hit[0], hit[1], berth_type)
+                best_rank = rank
+        return best
+
+    def occupy(self, coach, berth, start, end):
+        """Mark a berth as occupied on every segment in [start, end)"""
+        coach_class, berth_type, bit = self.berth_bits[(coach, berth)]
+        free_per_segment = self.group_free[(coach_class, berth_type)]
+        clear = ~(1 << bit)
+        for segment in range(start, end):
+            free_per_segment[segment] &= clear
+
+    def busy_until(self, coach, berth):
+        """Station after the last segment on which the berth is occupied (0 when it is free throughout)"""
+        coach_class, berth_type, bit = self.berth_bits[(coach, berth)]
+        free_per_segment = self.group_free[(coach_class, berth_type)]
+        for segment in range(self.num_segments - 1, -1, -1):
+            if not (free_per_segment[segment] >> bit) & 1:
+                return segment + 1
+        return 0
@@ -0,0 +1,303 @@
+# binary_manifest.py
+# FIXED-WIDTH BINARY MANIFEST (.rman) WITH A ZERO-COPY np.memmap READER
+# CSV, JSON and BSON make every consumer parse every field of every passenger. This
+# format stores a manifest the way PassengerTable holds it in memory:
+#
+#   magic "RMANIFST" | u32 version | u32 header length | JSON header (padded to 8 bytes)
+#   records          count x RECORD_DTYPE (48 bytes, little-endian)
+#   string heap      UTF-8 names and emails, addressed by (offset, length) from the records
+#
+# The header carries the dictionaries the records index into: station names in route
+# order, coach names, the enum tuples, and (when known) coaches by class and berth maps.
+# A record holds station indexes, coach and berth ints, and a status byte:
+#   bits 0-1 PNR status, bit 2 class, bit 3 gender, bit 4 passenger status, bit 5 no-show
+#
+# BinaryManifest maps the records and the heap with np.memmap, so opening a
+# multi-million passenger file reads only the header, and every column
+# (manifest.records["berth"], manifest.board(), ...) is a view into the page cache.
+#
+#   write_binary_manifest("l_1.rman", manifest.passengers, manifest.coaches_by_class, manifest.berth_maps)
+#   binary = BinaryManifest("l_1.rman")
+#   binary.record(0)                          # the same dict as the JSON / CSV exports
+#   verify_intervals(binary.intervals())      # manifest_verifier without parsing text
+#
+#   python binary_manifest.py l_1.rman        # header summary
+
+import argparse
+import json
+import os
+import struct
+import sys
+
+import numpy as np
+
+from passenger_table import BERTH_TYPES, CLASSES, GENDERS, PASSENGER_STATUSES, PNR_STATUSES
+
+MAGIC = b"RMANIFST"
+VERSION = 2  # 2: board / alight widened to u2 (routes over 256 stations)
+PREAMBLE = struct.Struct("<8sII")  # magic, version, header length
+
+RECORD_DTYPE = np.dtype([
+    ("pnr", "<i8"),
+    ("mobile", "<i8"),
+    ("irctc_seq", "<i4"),
+    ("name_offset", "<u4"),
+    ("email_offset", "<u4"),
+    ("name_length", "<u2"),
+    ("email_length", "<u2"),
+    ("berth", "<i2"),
+    ("rac_status", "<i2"),  # 0 means "-"
+    ("coach", "<u2"),  # index into header["coaches"]
+    ("board", "<u2"),  # index into header["stations"]
+    ("alight", "<u2"),
+    ("age", "u1"),
+    ("berth_type", "u1"),  # index into BERTH_TYPES
+    ("status", "u1"),  # packed enums, see STATUS_BITS
+    ("_pad", "V3"),
+])
+
+# Status byte: field -> (shift, mask)
+STATUS_BITS = {
+    "pnr_status": (0, 0b11),
+    "coach_class": (2, 0b1),
+    "gender": (3, 0b1),
+    "passenger_status": (4, 0b1),
+    "no_show": (5, 0b1),
+}
+
+
+def _aligned(n, to=8):
+    return (n + to - 1) // to * to
+
+
+# ----------------------------
+# WRITER
+# ----------------------------
+def write_binary_manifest(path, table, coaches_by_class=None, berth_maps=None):
+    """Write a PassengerTable (every row with its identity) as a .rman file; returns the record count"""
+    if table.pending_identities():
+        raise ValueError(f"{table.pending_identities()} rows have no identity yet")
+    n = len(table)
+    if len(table.station_names) > 1 << 16:
+        raise ValueError(f"{len(table.station_names)} stations do not fit 16-bit station indexes")
+    records = np.zeros(n, dtype=RECORD_DTYPE)
+    for field in ("pnr", "mobile", "irctc_seq", "berth", "rac_status", "board", "alight", "age", "berth_type"):
+        records[field] = np.array(getattr(table, field))
+    records["coach"] = np.array(table.coach.rows)
+
+    status = np.zeros(n, dtype=np.uint8)
+    for field, (shift, _) in STATUS_BITS.items():
+        status |= np.array(getattr(table, field), dtype=np.uint8) << np.uint8(shift)
+    records["status"] = status
+
+    # Both heaps of the table back to back: offsets are the previous row's end
+    names_end = np.array(table.names.ends, dtype=np.int64)
+    emails_end = np.array(table.emails.ends, dtype=np.int64) + len(table.names.data)
+    heap_size = len(table.names.data) + len(table.emails.data)
+    if heap_size >= 1 << 32:
+        raise ValueError("string heap over 4 GiB does not fit 32-bit offsets")
+    for prefix, ends, base in (("name", names_end, 0), ("email", emails_end, len(table.names.data))):
+        starts = np.concatenate(([base], ends[:-1])) if n else ends
+        records[f"{prefix}_offset"] = starts
+        records[f"{prefix}_length"] = ends - starts
+
+    header = {
+        "train_number": table.train_number,
+        "train_name": table.train_name,
+        "journey_date": table.journey_date,
+        "stations": table.station_names,
+        "coaches": table.coach.values,
+        "coaches_by_class": coaches_by_class,
+        "berth_maps": berth_maps,
+        "enums": {
+            "pnr_status": PNR_STATUSES,
+            "coach_class": CLASSES,
+            "berth_type": BERTH_TYPES,
+            "gender": GENDERS,
+            "passenger_status": PASSENGER_STATUSES,
+        },
+        "count": n,
+        "record_size": RECORD_DTYPE.itemsize,
+        "heap_size": heap_size,
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    header_bytes += b" " * (_aligned(PREAMBLE.size + len(header_bytes)) - PREAMBLE.size - len(header_bytes))
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(PREAMBLE.pack(MAGIC, VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(records.tobytes())
+        f.write(table.names.data)
+        f.write(table.emails.data)
+    os.replace(tmp, path)
+    return n
+
+
+# ----------------------------
+# READER
+# ----------------------------
+class BinaryManifest:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, version, header_length = PREAMBLE.unpack(f.read(PREAMBLE.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a binary manifest")
+            if version != VERSION:
+                raise ValueError(f"{path}: unsupported binary manifest version {version}")
+            self.header = json.loads(f.read(header_length))
+        if self.header["record_size"] != RECORD_DTYPE.itemsize:
+            raise ValueError(f"{path}: record size {self.header['record_size']} != {RECORD_DTYPE.itemsize}")
+
+        count = self.header["count"]
+        records_offset = PREAMBLE.size + header_length
+        heap_offset = records_offset + count * RECORD_DTYPE.itemsize
+        # np.memmap cannot map zero bytes, so empty sections are plain empty arrays
+        self.records = (np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=records_offset, shape=(count,))
+                        if count else np.zeros(0, dtype=RECORD_DTYPE))
+        self.heap = (np.memmap(path, dtype=np.uint8, mode="r", offset=heap_offset, shape=(self.header["heap_size"],))
+                     if self.header["heap_size"] else np.zeros(0, dtype=np.uint8))
+
+        self.station_names = self.header["stations"]
+        self.coach_names = self.header["coaches"]
+        self.coaches_by_class = self.header["coaches_by_class"]
+        self.berth_maps = self.header["berth_maps"]
+
+    def __len__(self):
+        return len(self.records)
+
+    # ----------------------------
+    # COLUMNS (views, except the unpacked status fields)
+    # ----------------------------
+    def column(self, field):
+        """Record field as an array; the status byte fields (STATUS_BITS) are unpacked to codes"""
+        if field in STATUS_BITS:
+            shift, mask = STATUS_BITS[field]
+            return (self.records["status"] >> np.uint8(shift)) & np.uint8(mask)
+        return self.records[field]
+
+    def board(self):
+        return self.records["board"]
+
+    def alight(self):
+        return self.records["alight"]
+
+    def coach_code(self, coach):
+        """Index of a coach name in the header (-1 if the manifest never uses it)"""
+        return self.coach_names.index(coach) if coach in self.coach_names else -1
+
+    def mask(self, field, value):
+        """Boolean row mask for an enum field (by its value name) or a station / coach field (by name)"""
+        if field in ("board", "alight"):
+            return self.records[field] == self.station_names.index(value)
+        if field == "coach":
+            return self.records["coach"] == self.coach_code(value)
+        return self.column(field) == self.header["enums"][field].index(value)
+
+    def string(self, offset, length):
+        return bytes(self.heap[offset:offset + length]).decode("utf-8")
+
+    def name(self, i):
+        return self.string(int(self.records["name_offset"][i]), int(self.records["name_length"][i]))
+
+    def email(self, i):
+        return self.string(int(self.records["email_offset"][i]), int(self.records["email_length"][i]))
+
+    # ----------------------------
+    # MATERIALISATION
+    # ----------------------------
+    def record(self, i):
+        """Export dict for row i (same fields and values as PassengerTable.record)"""
+        row = self.records[i]
+        status = int(row["status"])
+        enums = self.header["enums"]
+
+        def enum(field):
+            shift, mask = STATUS_BITS[field]
+            return (status >> shift) & mask
+
+        rac_status = int(row["rac_status"])
+        return {
+            "IRCTC_ID": f"IR_{int(row['irctc_seq']):04d}",
+            "PNR_Number": str(int(row["pnr"])),
+            "Train_Number": self.header["train_number"],
+            "Train_Name": self.header["train_name"],
+            "Journey_Date": self.header["journey_date"],
+            "Name": self.string(int(row["name_offset"]), int(row["name_length"])),
+            "Age": int(row["age"]),
+            "Gender": enums["gender"][enum("gender")],
+            "Mobile": str(int(row["mobile"])),
+            "Email": self.string(int(row["email_offset"]), int(row["email_length"])),
+            "PNR_Status": enums["pnr_status"][enum("pnr_status")],
+            "Class": enums["coach_class"][enum("coach_class")],
+            "Rac_status": str(rac_status) if rac_status else "-",
+            "Boarding_Station": self.station_names[int(row["board"])],
+            "Deboarding_Station": self.station_names[int(row["alight"])],
+            "Assigned_Coach": self.coach_names[int(row["coach"])],
+            "Assigned_berth": int(row["berth"]),
+            "Berth_Type": enums["berth_type"][int(row["berth_type"])],
+            "Passenger_Status": enums["passenger_status"][enum("passenger_status")],
+            "NO_show": bool(enum("no_show"))
+        }
+
+    def iter_records(self, rows=None):
+        for i in (range(len(self)) if rows is None else rows):
+            yield self.record(int(i))
+
+    def __iter__(self):
+        return self.iter_records()
+
+    def intervals(self):
+        """(coach, berth, start, end, label, is_rac) for manifest_verifier (label = row, WL skipped)"""
+        rows = np.flatnonzero(self.records["coach"] != self.coach_code("WL"))
+        is_rac = self.column("pnr_status")[rows] == self.header["enums"]["pnr_status"].index("RAC")
+        return list(zip(
+            [self.coach_names[c] for c in self.records["coach"][rows].tolist()],
+            self.records["berth"][rows].tolist(),
+            self.records["board"][rows].tolist(),
+            self.records["alight"][rows].tolist(),
+            rows.tolist(),
+            is_rac.tolist()
+        ))
+
+    def index(self):
+        """manifest_index.ManifestIndex over the mapped records"""
+        from manifest_index import ManifestIndex
+
+        return ManifestIndex.from_binary(self)
+
+    def occupancy(self):
+        """Berth x segment OccupancyMatrix (needs the coach / berth layout in the header)"""
+        from occupancy_matrix import OccupancyMatrix
+
+        if not self.coaches_by_class or not self.berth_maps:
+            raise ValueError(f"{self.path} was written without the coach / berth layout")
+        matrix = OccupancyMatrix(self.station_names, self.coaches_by_class, self.berth_maps)
+        rows = np.flatnonzero(self.records["coach"] != self.coach_code("WL"))
+        matrix.add_journeys([self.coach_names[c] for c in self.records["coach"][rows].tolist()],
+                            self.records["berth"][rows].tolist(),
+                            self.records["board"][rows], self.records["alight"][rows])
+        return matrix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarise a binary (.rman) passenger manifest")
+    parser.add_argument("manifest")
+    parser.add_argument("--records", type=int, default=0, help="also print the first N records")
+    args = parser.parse_args(argv)
+
+    binary = BinaryManifest(args.manifest)
+    header = binary.header
+    print(f"🚆 {header['train_number']} {header['train_name']} on {header['journey_date']}: "
+          f"{len(binary)} passengers, {len(binary.station_names)} stations, {len(binary.coach_names)} coaches, "
+          f"{header['heap_size']} heap bytes")
+    for status in header["enums"]["pnr_status"]:
+        print(f"   {status}: {int(np.count_nonzero(binary.mask('pnr_status', status)))}")
+    for i in range(min(args.records, len(binary))):
+        print(json.dumps(binary.record(i), ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
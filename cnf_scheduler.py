@@ -0,0 +1,107 @@
+# cnf_scheduler.py
+# INTERVAL-SCHEDULING CNF ALLOCATOR (alternative to first-fit in berth order)
+# CNF journeys are taken in boarding order. Berths wait in a min-heap keyed by the
+# station where they are released; every berth released by the time a passenger
+# boards goes back to a free pool, and the passenger takes the best free berth by the
+# usual preferences (preferred class first, then coach by coach with the berth types
+# in priority order - the same tie-breaks as FreeBerthIndex.first_free_in_class).
+# When every berth is taken, the passenger on board who alights last gives up the
+# berth if they would hold it past the newcomer's alighting station (they go to WL
+# instead). Boarding order plus that exchange seats the largest possible number of
+# passengers on the berths, in O(n log n) overall.
+#
+#   scheduler = IntervalScheduler(berth_index, ["Lower", "Middle", "Upper", "Side Upper"])
+#   slots = scheduler.schedule(journeys, class_orders)  # (class, coach, berth, berth_type) or None
+
+import heapq
+
+
+class IntervalScheduler:
+    def __init__(self, berth_index, berth_types):
+        """
+        berth_index: FreeBerthIndex with everything allocated so far (e.g. RAC pairs)
+        berth_types: berth types open to these passengers, in priority order
+        A berth that already holds someone is treated as taken from the start of the route
+        until FreeBerthIndex.busy_until(); any free stretch before that is not offered.
+        """
+        self.berth_index = berth_index
+        self.berth_types = berth_types
+
+    def _berths(self):
+        """(class, preference rank, coach, berth, berth_type) for every berth the passengers may use"""
+        index = self.berth_index
+        for coach_class in index.coaches_by_class:
+            for type_rank, berth_type in enumerate(self.berth_types):
+                for bit, (coach, berth) in enumerate(index.group_berths[(coach_class, berth_type)]):
+                    yield coach_class, (index.coach_rank[coach], type_rank, bit), coach, berth, berth_type
+
+    def schedule(self, journeys, class_orders):
+        """
+        journeys: [(board, alight)]; class_orders: for each journey the classes in preference order.
+        Returns one slot per journey, (coach_class, coach, berth, berth_type) or None for WL.
+        Nothing is written to the berth index.
+        """
+        free = {coach_class: [] for coach_class in self.berth_index.coaches_by_class}  # heaps by rank
+        busy = []  # heap of (release station, class, rank, coach, berth, berth_type, holder)
+        for coach_class, rank, coach, berth, berth_type in self._berths():
+            release = self.berth_index.busy_until(coach, berth)
+            if release:
+                busy.append((release, coach_class, rank, coach, berth, berth_type, None))
+            else:
+                free[coach_class].append((rank, coach, berth, berth_type))
+        heapq.heapify(busy)
+        for pool in free.values():
+            heapq.heapify(pool)
+
+        slots = [None] * len(journeys)
+        on_board = []  # max-heap of (-alight, journey) for seated passengers
+        for j in sorted(range(len(journeys)), key=lambda j: (journeys[j][0], journeys[j][1], j)):
+            board, alight = journeys[j]
+            while busy and busy[0][0] <= board:
+                _, coach_class, rank, coach, berth, berth_type, holder = heapq.heappop(busy)
+                if holder is None or slots[holder] is not None:  # skip berths of passengers moved to WL
+                    heapq.heappush(free[coach_class], (rank, coach, berth, berth_type))
+
+            slot = None
+            for coach_class in class_orders[j]:
+                if free[coach_class]:
+                    rank, coach, berth, berth_type = heapq.heappop(free[coach_class])
+                    slot = (coach_class, rank, coach, berth, berth_type)
+                    break
+            if slot is None:
+                while on_board and slots[on_board[0][1]] is None:
+                    heapq.heappop(on_board)
+                if not on_board or -on_board[0][0] <= alight:
+                    continue  # WL
+                _, bumped = heapq.heappop(on_board)
+                coach_class, coach, berth, berth_type = slots[bumped]
+                slot = (coach_class, self._rank(coach_class, coach, berth, berth_type), coach, berth, berth_type)
+                slots[bumped] = None
+
+            coach_class, rank, coach, berth, berth_type = slot
+            slots[j] = (coach_class, coach, berth, berth_type)
+            heapq.heappush(busy, (alight, coach_class, rank, coach, berth, berth_type, j))
+            heapq.heappush(on_board, (-alight, j))
+        return slots
+
+    def _rank(self, coach_class, coach, berth, berth_type):
+        index = self.berth_index
+        return (index.coach_rank[coach], self.berth_types.index(berth_type), index.berth_bits[(coach, berth)][2])
+
+
+def first_fit(berth_index, journeys, class_orders, berth_types):
+    """
+    Slots the current first-fit rule gives the same journeys in the given (booking) order,
+    occupying berth_index as it goes - pass a copy for a dry run.
+    """
+    slots = []
+    for (board, alight), classes in zip(journeys, class_orders):
+        slot = None
+        for coach_class in classes:
+            hit = berth_index.first_free_in_class(coach_class, berth_types, board, alight)
+            if hit is not None:
+                berth_index.occupy(hit[0], hit[1], board, alight)
+                slot = (coach_class,) + hit
+                break
+        slots.append(slot)
+    return slots
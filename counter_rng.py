@@ -0,0 +1,113 @@
+# counter_rng.py
+# COUNTER-BASED RANDOMNESS (PHILOX4x32-10)
+# random.Random(seed) is one sequential stream: a draw depends on every draw before it,
+# so reordering or splitting the work changes every later name, age and berth choice.
+# Here a draw is a pure function of its key instead:
+#   key     = (seed, train number, journey date)        -> Philox key (2 x 32 bits)
+#   counter = (passenger slot, draw number, stream name) -> Philox counter (4 x 32 bits)
+# so a passenger's choices depend only on (seed, train, date, slot) and any shard of
+# slots can be computed anywhere, in any order, with identical results. Philox4x32-10
+# (Salmon et al., "Parallel random numbers: as easy as 1, 2, 3", SC'11) is evaluated
+# with numpy over whole arrays of counters at once.
+#
+#   keyed = CounterRNG(20251116, "17225", "15-11-2025")
+#   keyed.uniforms("age", np.arange(1000))     # one float per slot
+#   keyed.slot("class", 42).random() < 0.8     # random.Random-like view of one slot
+#
+# SequentialDraws wraps a random.Random with the same slot() / shuffle() interface, so
+# the generators draw through one object and the default (sequential) output is unchanged.
+
+import zlib
+
+import numpy as np
+
+from identity_generators import derive_key
+
+PHILOX_M0 = 0xD2511F53
+PHILOX_M1 = 0xCD9E8D57
+PHILOX_W0 = 0x9E3779B9
+PHILOX_W1 = 0xBB67AE85
+MASK32 = np.uint64(0xFFFFFFFF)
+
+
+def philox4x32(c0, c1, c2, c3, k0, k1, rounds=10):
+    """Philox4x32 over uint64 arrays holding 32-bit words; returns the four output words"""
+    c0, c1, c2, c3 = (np.asarray(c, dtype=np.uint64) & MASK32 for c in (c0, c1, c2, c3))
+    c1, c2, c3 = np.broadcast_arrays(c1, c2, c3)
+    shift = np.uint64(32)
+    for r in range(rounds):
+        if r:
+            k0, k1 = (k0 + PHILOX_W0) & 0xFFFFFFFF, (k1 + PHILOX_W1) & 0xFFFFFFFF
+        p0 = c0 * np.uint64(PHILOX_M0)
+        p1 = c2 * np.uint64(PHILOX_M1)
+        c0, c1, c2, c3 = ((p1 >> shift) ^ c1 ^ np.uint64(k0), p1 & MASK32,
+                          (p0 >> shift) ^ c3 ^ np.uint64(k1), p0 & MASK32)
+    return c0, c1, c2, c3
+
+
+class CounterRNG:
+    def __init__(self, seed, *context):
+        key = derive_key(":".join(str(part) for part in (seed,) + context), "philox")
+        self.k0, self.k1 = key >> 32, key & 0xFFFFFFFF
+
+    def _stream_id(self, stream):
+        return zlib.crc32(stream.encode("utf-8"))
+
+    def raw(self, stream, slots, draw=0):
+        """64 random bits per slot (uint64 array)"""
+        slots = np.asarray(slots, dtype=np.uint64)
+        x0, x1, _, _ = philox4x32(slots, slots >> np.uint64(32), draw, self._stream_id(stream), self.k0, self.k1)
+        return (x0 << np.uint64(32)) | x1
+
+    def uniforms(self, stream, slots, draw=0):
+        """Floats in [0, 1) with 53 random bits, one per slot"""
+        return (self.raw(stream, slots, draw) >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+
+    def integers(self, stream, slots, low, high, draw=0):
+        """Integers in [low, high] (inclusive, like random.randint), one per slot"""
+        return low + (self.uniforms(stream, slots, draw) * (high - low + 1)).astype(np.int64)
+
+    def permutation(self, stream, n):
+        """A keyed permutation of range(n): position i goes to rank of its uniform"""
+        return np.argsort(self.uniforms(stream, np.arange(n)), kind="stable")
+
+    def shuffle(self, stream, seq):
+        """Shuffle a list in place (keyed, so the same list always lands in the same order)"""
+        seq[:] = [seq[i] for i in self.permutation(stream, len(seq)).tolist()]
+
+    def slot(self, stream, slot):
+        return SlotRandom(self, stream, slot)
+
+
+class SlotRandom:
+    """The random.Random methods the generators use, drawing from one (stream, slot) key"""
+
+    def __init__(self, keyed, stream, slot):
+        self.keyed = keyed
+        self.stream = stream
+        self.slot = slot
+        self.draws = 0
+
+    def random(self):
+        value = float(self.keyed.uniforms(self.stream, [self.slot], self.draws)[0])
+        self.draws += 1
+        return value
+
+    def randint(self, a, b):
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+
+class SequentialDraws:
+    """One shared random.Random behind the CounterRNG interface (draw order is the key)"""
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def slot(self, stream, slot):
+        return self.rng
+
+    def shuffle(self, stream, seq):
+        self.rng.shuffle(seq)
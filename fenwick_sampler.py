@@ -0,0 +1,67 @@
+# fenwick_sampler.py
+# WEIGHTED SAMPLING WITH IN-PLACE WEIGHT UPDATES (FENWICK / BINARY INDEXED TREE)
+# The journey builder draws an alighting station for every boarding passenger from
+# the stations after it, weighted, and drops a station once its alighting quota is
+# used up. Rebuilding the candidate and weight lists for every draw is O(stations);
+# a Fenwick tree over the weights makes a draw restricted to a suffix and a weight
+# change O(log stations) each.
+#
+# sample() consumes exactly one rng.random() and picks the same item as
+# rng.choices(items[lo:], weights[lo:])[0] for integer weights, so swapping it in keeps
+# seeded output identical.
+#
+#   sampler = FenwickSampler([1, 1, 10, 10])
+#   sampler.sample(rng, lo=1)   # index 1, 2 or 3 with odds 1 : 10 : 10
+#   sampler.set(2, 0)           # index 2 can no longer be drawn
+
+
+class FenwickSampler:
+    def __init__(self, weights):
+        self.size = len(weights)
+        self.weights = list(weights)
+        self.tree = [0] * (self.size + 1)
+        for i, weight in enumerate(self.weights):
+            self._add(i, weight)
+        self.top = 1 << self.size.bit_length() if self.size else 0
+
+    def _add(self, i, delta):
+        i += 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, n):
+        """Sum of the weights of items [0, n)"""
+        total = 0
+        while n > 0:
+            total += self.tree[n]
+            n -= n & -n
+        return total
+
+    def set(self, i, weight):
+        self._add(i, weight - self.weights[i])
+        self.weights[i] = weight
+
+    def total(self, lo=0):
+        """Sum of the weights of items [lo, size)"""
+        return self.prefix(self.size) - self.prefix(lo)
+
+    def sample(self, rng, lo=0):
+        """Index >= lo drawn with probability proportional to its weight, or None if they are all 0"""
+        base = self.prefix(lo)
+        total = self.prefix(self.size) - base
+        if total <= 0:
+            return None
+        x = rng.random() * total
+        # Descend to the longest prefix whose weight past lo is still <= x; the next item
+        # is the first whose cumulative weight exceeds x (bisect_right, as rng.choices does)
+        pos = 0
+        acc = -base
+        step = self.top
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and acc + self.tree[nxt] <= x:
+                pos = nxt
+                acc += self.tree[nxt]
+            step >>= 1
+        return max(pos, lo)
@@ -0,0 +1,132 @@
+# generation_metrics.py
+# STRUCTURED GENERATION METRICS
+# The generators narrate their progress with emoji log lines; this records the same
+# run as numbers so large-scale runs can be compared and plotted:
+#   - wall and CPU time per phase (phase() marks the start of the next phase, so the
+#     generate() bodies only gain one line per PHASE banner)
+#   - probes per allocation: free-berth index lookups (one per class x berth type
+#     group) spent before a passenger was seated, as a histogram per allocation kind
+#   - failures by reason: overlap (no berth free over the whole journey), rac_capacity
+#     (more RAC pairs on board than Side Lowers), rac_no_partner (no overlapping journey
+#     to share with). Locked constraint berths are not enforced when seating (the
+#     optimized allocator books with check_locked=False), so they never cause a failure
+#   - RNG draws spent in the identity generators (attribute_synthesis.py)
+#
+#   metrics = GenerationMetrics()
+#   manifest = generate(config, seed, metrics=metrics)
+#   metrics.write("metrics.json")
+#
+# profiled() wraps any block in cProfile (stdlib) or pyinstrument (optional).
+
+import contextlib
+import json
+import time
+from collections import Counter, defaultdict
+
+
+class GenerationMetrics:
+    def __init__(self):
+        self.phases = {}  # name -> {'wall_s', 'cpu_s'}
+        self.counters = Counter()
+        self.failures = Counter()  # reason -> count
+        self.probes = defaultdict(Counter)  # allocation kind -> {probes: allocations}
+        self.rng_draws = {}
+        self._current = None  # (name, wall start, cpu start)
+
+    # ----------------------------
+    # PHASES
+    # ----------------------------
+    def phase(self, name):
+        """End the running phase (if any) and start timing the next one"""
+        self.stop()
+        self._current = (name, time.perf_counter(), time.process_time())
+
+    def stop(self):
+        """End the running phase; a phase entered twice accumulates"""
+        if self._current is None:
+            return
+        name, wall, cpu = self._current
+        timing = self.phases.setdefault(name, {'wall_s': 0.0, 'cpu_s': 0.0})
+        timing['wall_s'] += time.perf_counter() - wall
+        timing['cpu_s'] += time.process_time() - cpu
+        self._current = None
+
+    # ----------------------------
+    # COUNTERS
+    # ----------------------------
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def fail(self, reason, n=1):
+        self.failures[reason] += n
+
+    def probe(self, kind, probes, n=1):
+        """n allocation attempts of this kind that took probes index lookups each"""
+        self.probes[kind][probes] += n
+
+    def probe_summary(self, kind):
+        histogram = self.probes[kind]
+        attempts = sum(histogram.values())
+        total = sum(p * n for p, n in histogram.items())
+        return {
+            'attempts': attempts,
+            'mean': total / attempts if attempts else 0.0,
+            'max': max(histogram) if histogram else 0,
+            'histogram': {str(p): n for p, n in sorted(histogram.items())}
+        }
+
+    # ----------------------------
+    # OUTPUT
+    # ----------------------------
+    def to_dict(self):
+        self.stop()
+        return {
+            'phases': self.phases,
+            'wall_s': sum(t['wall_s'] for t in self.phases.values()),
+            'cpu_s': sum(t['cpu_s'] for t in self.phases.values()),
+            'probes': {kind: self.probe_summary(kind) for kind in self.probes},
+            'failures': dict(self.failures),
+            'counters': dict(self.counters),
+            'rng_draws': self.rng_draws
+        }
+
+    def write(self, path, **extra):
+        """JSON metrics file; extra keys (seed, config, ...) are stored alongside"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({**extra, **self.to_dict()}, f, indent=2)
+
+
+@contextlib.contextmanager
+def profiled(mode, output):
+    """
+    Profile the block: mode "cprofile" dumps pstats to output (read with python -m pstats
+    or snakeviz), "pyinstrument" writes an HTML report (needs pyinstrument), None does nothing.
+    """
+    if not mode:
+        yield
+        return
+    if mode == "cprofile":
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(output)
+    elif mode == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            raise RuntimeError("pyinstrument profiling needs: pip install pyinstrument") from None
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            with open(output, "w", encoding="utf-8") as f:
+                f.write(profiler.output_html())
+    else:
+        raise ValueError(f"Unknown profiler '{mode}' (expected cprofile or pyinstrument)")
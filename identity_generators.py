@@ -0,0 +1,161 @@
+# identity_generators.py
+# REJECTION-FREE UNIQUE IDENTITY GENERATORS
+# The k-th name / mobile number is the k-th element of a seeded pseudo-random
+# permutation of the whole name / mobile space, so every draw is O(1), can never
+# repeat, and needs no growing "already used" set. The permutation is a small
+# Feistel network (a bijection on a power-of-two range) with cycle walking to fit
+# the exact size of the space; the same seed always gives the same sequence.
+#
+#   names = UniqueNames(first_names, middle, last, seed=SEED)
+#   next(names)      -> "Kavya Prasad Iyer"
+#   names.take(1000) -> the next 1000 names in one vectorised permutation pass
+#   names[40000]     -> any position directly (names past the space get " 2", " 3", ...)
+
+import hashlib
+
+import numpy as np
+
+MASK64 = (1 << 64) - 1
+
+
+def derive_key(seed, stream):
+    """64-bit key for one identity stream ("names", "mobiles") of a seed"""
+    digest = hashlib.sha256(f"{seed}:{stream}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def _mix64(x):
+    """splitmix64 finaliser: a cheap, well-distributed 64-bit hash"""
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+def _mix64_array(x):
+    """_mix64 over a uint64 array (multiplication wraps modulo 2**64 like the & MASK64 above)"""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class Permutation:
+    """Seeded bijection of range(size)"""
+
+    def __init__(self, size, key, rounds=4):
+        self.size = size
+        self.half = (max(2, (size - 1).bit_length()) + 1) // 2
+        self.mask = (1 << self.half) - 1
+        self.round_keys = [_mix64((key + r * 0x9E3779B97F4A7C15) & MASK64) for r in range(rounds)]
+        self.encryptions = 0  # Feistel evaluations, cycle-walking steps included
+
+    def _encrypt(self, x):
+        left, right = x >> self.half, x & self.mask
+        for k in self.round_keys:
+            left, right = right, left ^ (_mix64(right ^ k) & self.mask)
+        return (left << self.half) | right
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.size:
+            raise IndexError(f"{i} outside permutation of {self.size}")
+        # Cycle walking: the Feistel range is < 4x size, so this loops ~2 times on average
+        x = self._encrypt(i)
+        self.encryptions += 1
+        while x >= self.size:
+            x = self._encrypt(x)
+            self.encryptions += 1
+        return x
+
+    def _encrypt_array(self, x):
+        half, mask = np.uint64(self.half), np.uint64(self.mask)
+        left, right = x >> half, x & mask
+        for k in self.round_keys:
+            left, right = right, left ^ (_mix64_array(right ^ np.uint64(k)) & mask)
+        return (left << half) | right
+
+    def take(self, indexes):
+        """Vectorised __getitem__ for an array of positions, as an int64 array"""
+        indexes = np.asarray(indexes, dtype=np.int64)
+        if indexes.size and (indexes.min() < 0 or indexes.max() >= self.size):
+            raise IndexError(f"positions outside permutation of {self.size}")
+        x = self._encrypt_array(indexes.astype(np.uint64))
+        self.encryptions += x.size
+        outside = x >= self.size
+        while outside.any():
+            x[outside] = self._encrypt_array(x[outside])
+            self.encryptions += int(np.count_nonzero(outside))
+            outside = x >= self.size
+        return x.astype(np.int64)
+
+    def __len__(self):
+        return self.size
+
+
+class UniqueNames:
+    """Names ("First Middle Last" or "First Last") in seeded random order, never repeating"""
+
+    def __init__(self, first, middle, last, seed):
+        self.first, self.middle, self.last = list(first), list(middle), list(last)
+        self.three_part = len(self.first) * len(self.middle) * len(self.last)
+        self.size = self.three_part + len(self.first) * len(self.last)
+        self.order = Permutation(self.size, derive_key(seed, "names"))
+        self.drawn = 0
+
+    def _name(self, j, cycle):
+        if j < self.three_part:
+            f, rest = divmod(j, len(self.middle) * len(self.last))
+            m, l = divmod(rest, len(self.last))
+            name = f"{self.first[f]} {self.middle[m]} {self.last[l]}"
+        else:
+            f, l = divmod(j - self.three_part, len(self.last))
+            name = f"{self.first[f]} {self.last[l]}"
+        # Once every combination is used, start again with a generation number
+        return name if cycle == 0 else f"{name} {cycle + 1}"
+
+    def __getitem__(self, i):
+        cycle, slot = divmod(i, self.size)
+        return self._name(self.order[slot], cycle)
+
+    def take(self, count):
+        """The next count names as a list (permutation evaluated as one array operation)"""
+        cycles, slots = np.divmod(np.arange(self.drawn, self.drawn + count), self.size)
+        self.drawn += count
+        return [self._name(j, cycle) for j, cycle in zip(self.order.take(slots).tolist(), cycles.tolist())]
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        name = self[self.drawn]
+        self.drawn += 1
+        return name
+
+
+class UniqueMobiles:
+    """10-digit Indian mobile numbers (6/7/8/9 + 9 digits) in seeded random order, never repeating"""
+
+    PREFIXES = "6789"
+    PER_PREFIX = 900000000  # 100000000..999999999
+
+    def __init__(self, seed):
+        self.order = Permutation(len(self.PREFIXES) * self.PER_PREFIX, derive_key(seed, "mobiles"))
+        self.drawn = 0
+
+    def __getitem__(self, i):
+        prefix, number = divmod(self.order[i], self.PER_PREFIX)
+        return f"{self.PREFIXES[prefix]}{100000000 + number}"
+
+    def take(self, count):
+        """The next count mobiles as an int64 array of 10-digit numbers"""
+        positions = np.arange(self.drawn, self.drawn + count)
+        prefix, number = np.divmod(self.order.take(positions), self.PER_PREFIX)
+        self.drawn += count
+        digits = np.array([int(d) for d in self.PREFIXES], dtype=np.int64)
+        return digits[prefix] * 1000000000 + 100000000 + number
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        mobile = self[self.drawn]
+        self.drawn += 1
+        return mobile
@@ -0,0 +1,154 @@
+# manifest_exporters.py
+# STREAMING MANIFEST EXPORTERS
+# Each exporter takes one passenger record at a time (write) and keeps only a small
+# buffer, so peak memory does not grow with the manifest and readers can start on a
+# partially written file. Attach them to a PassengerTable with add_sink() and they
+# receive every record once its identity is filled in: the generators do that every
+# FILL_CHUNK allocated rows (attribute_synthesis.py), so a file grows while the
+# allocation is still running.
+#
+#   .csv              CSV with the FIELDS header
+#   .ndjson / .jsonl  one JSON document per line
+#   .parquet          columnar Parquet, one row group per batch (needs pyarrow)
+#   .json             pretty-printed single JSON array (compatibility mode, same
+#                     bytes as json.dump(records, f, indent=2, ensure_ascii=False))
+#
+# Text formats can be compressed with gzip (.gz) or zstd (.zst, needs zstandard).
+# The fixed-width binary format (.rman) is written from a finished manifest instead
+# (Manifest.write_binary, binary_manifest.py).
+
+import csv
+import gzip
+import io
+import json
+
+from passenger_table import FIELDS
+
+
+def open_text(path, compression=None):
+    """Open path for UTF-8 text writing, optionally through gzip or zstd"""
+    if compression is None:
+        if path.endswith(".gz"):
+            compression = "gzip"
+        elif path.endswith(".zst"):
+            compression = "zstd"
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("zstd compression needs the 'zstandard' package (pip install zstandard)") from e
+        raw = zstandard.ZstdCompressor().stream_writer(open(path, "wb"), closefd=True)
+        return io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    if compression:
+        raise ValueError(f"Unknown compression: {compression}")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+class CsvExporter:
+    def __init__(self, path, compression=None, flush_every=200):
+        self.f = open_text(path, compression)
+        self.writer = csv.DictWriter(self.f, fieldnames=FIELDS)
+        self.writer.writeheader()
+        self.flush_every = flush_every
+        self.count = 0
+
+    def write(self, record):
+        self.writer.writerow(record)
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+class NdjsonExporter:
+    def __init__(self, path, compression=None, flush_every=200):
+        self.f = open_text(path, compression)
+        self.flush_every = flush_every
+        self.count = 0
+
+    def write(self, record):
+        self.f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+class JsonArrayExporter:
+    """Pretty-printed JSON array written record by record (compatibility mode)"""
+
+    def __init__(self, path, compression=None, indent=2):
+        self.f = open_text(path, compression)
+        self.indent = indent
+        self.count = 0
+
+    def write(self, record):
+        pad = " " * self.indent
+        body = json.dumps(record, indent=self.indent, ensure_ascii=False).replace("\n", "\n" + pad)
+        self.f.write(("[\n" if self.count == 0 else ",\n") + pad + body)
+        self.count += 1
+
+    def close(self):
+        self.f.write("\n]" if self.count else "[]")
+        self.f.close()
+
+
+class ParquetExporter:
+    """Columnar Parquet output; rows are buffered per column and flushed as row groups"""
+
+    def __init__(self, path, compression="zstd", batch_size=10000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export needs the 'pyarrow' package (pip install pyarrow)") from e
+        self.pa = pa
+        types = {"Age": pa.int16(), "Assigned_berth": pa.int16(), "NO_show": pa.bool_()}
+        self.schema = pa.schema([(field, types.get(field, pa.string())) for field in FIELDS])
+        self.writer = pq.ParquetWriter(path, self.schema, compression=compression or "none")
+        self.batch_size = batch_size
+        self.columns = {field: [] for field in FIELDS}
+        self.buffered = 0
+        self.count = 0
+
+    def write(self, record):
+        for field in FIELDS:
+            self.columns[field].append(record[field])
+        self.buffered += 1
+        self.count += 1
+        if self.buffered >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self.buffered:
+            self.writer.write_table(self.pa.Table.from_pydict(self.columns, schema=self.schema))
+            self.columns = {field: [] for field in FIELDS}
+            self.buffered = 0
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+
+def open_exporter(path, fmt=None, compression=None):
+    """Exporter for path; the format is taken from the extension unless fmt is given"""
+    if fmt is None:
+        name = path[:-3] if path.endswith(".gz") else path[:-4] if path.endswith(".zst") else path
+        fmt = name.rsplit(".", 1)[-1]
+    if fmt == "csv":
+        return CsvExporter(path, compression)
+    if fmt in ("ndjson", "jsonl"):
+        return NdjsonExporter(path, compression)
+    if fmt == "json":
+        return JsonArrayExporter(path, compression)
+    if fmt == "parquet":
+        return ParquetExporter(path, compression or "zstd")
+    if fmt == "rman":
+        raise ValueError("rman manifests are written from the finished manifest (Manifest.write_binary)")
+    raise ValueError(f"Unknown export format: {fmt}")
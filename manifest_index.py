@@ -0,0 +1,168 @@
+# manifest_index.py
+# INDEXED QUERIES OVER A GENERATED MANIFEST
+# Built once from the passenger columns (PassengerTable or BinaryManifest); every query
+# is then a hash lookup or a binary search instead of a scan with string comparisons:
+#   - PNR / IRCTC_ID -> row                          hash indexes, O(1)
+#   - (coach, berth) -> rows in boarding order       sorted keys, O(log n + k)
+#   - boarding / alighting station (+ PNR status)    sorted keys, O(log n + k)
+#   - segment (+ PNR status) -> rows onboard         per-segment interval index, O(log n + k)
+# A journey board -> alight is listed under every segment it travels (board <= s < alight),
+# and within a segment rows are ordered by PNR status, so "RAC passengers onboard after
+# station 12" is one contiguous slice. WL passengers hold no berth and are only in the
+# PNR / IRCTC_ID indexes.
+#
+#   index = manifest.index()
+#   index.occupants("S4", 23, "Guntur Jn", "Nandyal")   # rows on S4-23 over that stretch
+#   index.onboard(12, "RAC")                           # RAC rows onboard from station 12
+#   manifest.passengers.record(index.pnr("1000000042"))
+
+import numpy as np
+
+from passenger_table import PNR_STATUSES
+
+STATUS_SPAN = len(PNR_STATUSES)  # keys are position * STATUS_SPAN + status code
+BERTH_SPAN = 1 << 16  # berth keys are coach code * BERTH_SPAN + berth
+
+
+class ManifestIndex:
+    def __init__(self, station_names, coach_names, pnr, irctc_seq, coach, berth, board, alight, pnr_status):
+        """Parallel per-row columns (coach as codes into coach_names, stations as route indexes)"""
+        self.station_names = list(station_names)
+        self.station_index = {name: i for i, name in enumerate(self.station_names)}
+        self.coach_names = list(coach_names)
+        self.coach_codes = {name: i for i, name in enumerate(self.coach_names)}
+        self.size = len(pnr)
+
+        self.pnr_rows = {int(p): row for row, p in enumerate(np.asarray(pnr).tolist())}
+        self.irctc_rows = {int(seq): row for row, seq in enumerate(np.asarray(irctc_seq).tolist())}
+
+        coach = np.asarray(coach, dtype=np.int64)
+        berth = np.asarray(berth, dtype=np.int64)
+        board = np.asarray(board, dtype=np.int64)
+        alight = np.asarray(alight, dtype=np.int64)
+        status = np.asarray(pnr_status, dtype=np.int64)
+        seated = np.flatnonzero(coach != self.coach_codes.get("WL", -1))
+        self.board = board
+        self.alight = alight
+        self.status = status
+
+        # (coach, berth) -> rows, ordered by boarding station
+        berth_keys = coach[seated] * BERTH_SPAN + berth[seated]
+        order = np.lexsort((board[seated], berth_keys))
+        self.berth_rows_sorted = seated[order]
+        self.berth_keys = berth_keys[order]
+
+        # station (+ status) -> rows, for boarding and alighting
+        self.boarding_rows, self.boarding_keys = self._by_key(seated, board[seated] * STATUS_SPAN + status[seated])
+        self.alighting_rows, self.alighting_keys = self._by_key(seated, alight[seated] * STATUS_SPAN + status[seated])
+
+        # segment (+ status) -> rows onboard: every journey repeated once per segment it travels
+        lengths = np.maximum(alight[seated] - board[seated], 0)
+        rows = np.repeat(seated, lengths)
+        first = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        segments = np.repeat(board[seated], lengths) + np.arange(rows.size) - first
+        self.segment_rows, self.segment_keys = self._by_key(rows, segments * STATUS_SPAN + status[rows])
+
+    @staticmethod
+    def _by_key(rows, keys):
+        order = np.lexsort((rows, keys))
+        return rows[order], keys[order]
+
+    @classmethod
+    def from_table(cls, table):
+        return cls(table.station_names, table.coach.values, table.pnr, table.irctc_seq, table.coach.rows,
+                   table.berth, table.board, table.alight, table.pnr_status)
+
+    @classmethod
+    def from_binary(cls, binary):
+        """From a binary_manifest.BinaryManifest (reads the mapped columns once)"""
+        return cls(binary.station_names, binary.coach_names, binary.records["pnr"], binary.records["irctc_seq"],
+                   binary.records["coach"], binary.records["berth"], binary.records["board"],
+                   binary.records["alight"], binary.column("pnr_status"))
+
+    def __len__(self):
+        return self.size
+
+    # ----------------------------
+    # POINT LOOKUPS
+    # ----------------------------
+    def station(self, station):
+        """Route index of a station given by name or index"""
+        return self.station_index[station] if isinstance(station, str) else int(station)
+
+    def pnr(self, pnr):
+        """Row of a PNR ("1000000042" or 1000000042), or None"""
+        return self.pnr_rows.get(int(pnr))
+
+    def irctc(self, irctc_id):
+        """Row of an IRCTC ID ("IR_0042" or 42), or None"""
+        if isinstance(irctc_id, str):
+            irctc_id = irctc_id.rsplit("_", 1)[-1]
+        return self.irctc_rows.get(int(irctc_id))
+
+    def berth_rows(self, coach, berth):
+        """Rows holding coach-berth, in boarding order"""
+        code = self.coach_codes.get(coach)
+        if code is None:
+            return self.berth_rows_sorted[:0]
+        key = code * BERTH_SPAN + berth
+        lo, hi = np.searchsorted(self.berth_keys, [key, key + 1])
+        return self.berth_rows_sorted[lo:hi]
+
+    def occupants(self, coach, berth, start=0, end=None):
+        """Rows on coach-berth at any time between stations start and end (names or indexes)"""
+        start = self.station(start)
+        end = len(self.station_names) - 1 if end is None else self.station(end)
+        rows = self.berth_rows(coach, berth)
+        rows = rows[:np.searchsorted(self.board[rows], end)]  # boarded before end
+        return rows[self.alight[rows] > start]
+
+    # ----------------------------
+    # STATION / SEGMENT QUERIES
+    # ----------------------------
+    def _slice(self, rows, keys, position, status):
+        if status is None:
+            lo, hi = np.searchsorted(keys, [position * STATUS_SPAN, (position + 1) * STATUS_SPAN])
+        else:
+            key = position * STATUS_SPAN + PNR_STATUSES.index(status)
+            lo, hi = np.searchsorted(keys, [key, key + 1])
+        return rows[lo:hi]
+
+    def boarding_at(self, station, status=None):
+        """Rows boarding at station (optionally only one PNR status), by PNR status then row"""
+        return self._slice(self.boarding_rows, self.boarding_keys, self.station(station), status)
+
+    def alighting_at(self, station, status=None):
+        return self._slice(self.alighting_rows, self.alighting_keys, self.station(station), status)
+
+    def onboard(self, station, status=None):
+        """Rows onboard between station and the next one (board <= station < alight)"""
+        return self._slice(self.segment_rows, self.segment_keys, self.station(station), status)
+
+    def onboard_between(self, start, end, status=None):
+        """Rows onboard on any segment from station start up to station end, in row order"""
+        start, end = self.station(start), self.station(end)
+        lo = np.searchsorted(self.segment_keys, start * STATUS_SPAN)
+        hi = np.searchsorted(self.segment_keys, end * STATUS_SPAN)
+        rows = self.segment_rows[lo:hi]
+        if status is not None:
+            rows = rows[self.segment_keys[lo:hi] % STATUS_SPAN == PNR_STATUSES.index(status)]
+        return np.unique(rows)
+
+    def berths(self, status=None):
+        """Distinct (coach, berth) pairs held by passengers (of one PNR status), in coach / berth order"""
+        keys = self.berth_keys
+        if status is not None:
+            keys = keys[self.status[self.berth_rows_sorted] == PNR_STATUSES.index(status)]
+        return [(self.coach_names[key // BERTH_SPAN], key % BERTH_SPAN) for key in np.unique(keys).tolist()]
+
+    def intervals(self):
+        """(coach, berth, start, end, row, is_rac) per seated row, grouped by berth (manifest_verifier input)"""
+        rows = self.berth_rows_sorted
+        rac = PNR_STATUSES.index("RAC")
+        return [
+            (self.coach_names[key // BERTH_SPAN], key % BERTH_SPAN, board, alight, row, status == rac)
+            for key, board, alight, row, status in zip(
+                self.berth_keys.tolist(), self.board[rows].tolist(), self.alight[rows].tolist(),
+                rows.tolist(), self.status[rows].tolist())
+        ]
@@ -0,0 +1,230 @@
+# manifest_verifier.py
+# SWEEP-LINE COLLISION VERIFIER FOR GENERATED MANIFESTS
+# Each berth's journeys are sorted by boarding station and swept left to right with
+# a min-heap of alighting stations, so every overlapping pair is found without
+# comparing every pair of allocations (O(n log n) overall).
+# Reports:
+#   - CNF overlaps (two journeys on one berth overlap and they are not both RAC)
+#   - RAC berths with only one occupant
+#   - RAC WITHOUT OVERLAP (a RAC passenger whose journey meets no other RAC passenger on
+#     its berth; pairs using one Side Lower one after another are fine)
+#
+# Usage:
+#   python manifest_verifier.py amaravati_correct_allocation.json --stations stations.json
+#   python manifest_verifier.py amaravati_correct_allocation.csv --stations stations.txt
+#   python manifest_verifier.py amaravati_correct_allocation.rman   # stations come from the file
+#   python manifest_verifier.py --mongo-db PassengersDB --mongo-collection P_1 \
+#       --stations-db rac --stations-collection 17225
+# Exit code is 1 when any problem is found, so it can gate a dataset before loading.
+
+import argparse
+import csv
+import heapq
+import json
+import sys
+from collections import defaultdict
+
+from passenger_table import PNR_STATUSES
+
+
+# ----------------------------
+# INPUT ADAPTERS -> [(coach, berth, start, end, label, is_rac)]
+# ----------------------------
+def intervals_from_allocator(allocator):
+    """Intervals from an in-memory CorrectAllocator / OptimizedAllocator"""
+    return [
+        (coach, berth, start, end, pid, is_rac)
+        for (coach, berth), allocations in allocator.allocations.items()
+        for start, end, pid, is_rac in allocations
+    ]
+
+
+def intervals_from_table(table):
+    """Intervals from a PassengerTable (label = row number, WL passengers skipped)"""
+    wl_code = table.coach.codes.get("WL", -1)
+    rac_code = PNR_STATUSES.index("RAC")
+    coach_names = table.coach.values
+    return [
+        (coach_names[coach], berth, board, alight, row, status == rac_code)
+        for row, (coach, berth, board, alight, status) in enumerate(
+            zip(table.coach.rows, table.berth, table.board, table.alight, table.pnr_status))
+        if coach != wl_code
+    ]
+
+
+def intervals_from_records(records, station_names):
+    """Intervals from passenger documents (JSON / CSV rows / MongoDB), WL passengers skipped"""
+    station_index = {name: i for i, name in enumerate(station_names)}
+    intervals = []
+    for record in records:
+        if record["Assigned_Coach"] == "WL":
+            continue
+        intervals.append((
+            record["Assigned_Coach"],
+            int(record["Assigned_berth"]),
+            station_index[record["Boarding_Station"]],
+            station_index[record["Deboarding_Station"]],
+            record.get("PNR_Number") or record.get("IRCTC_ID"),
+            record["PNR_Status"] == "RAC"
+        ))
+    return intervals
+
+
+def load_records(path):
+    """Passenger documents from a .json array, .ndjson/.jsonl or .csv export"""
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".ndjson", ".jsonl")):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+
+def load_station_names(path):
+    """Station names in route order from a JSON list (names or {SNO, Station_Name} docs) or a text file"""
+    with open(path, encoding="utf-8") as f:
+        if not path.endswith(".json"):
+            return [line.strip() for line in f if line.strip()]
+        data = json.load(f)
+    if data and isinstance(data[0], dict):
+        return [s["Station_Name"] for s in sorted(data, key=lambda s: s["SNO"])]
+    return list(data)
+
+
+def load_from_mongo(uri, db_name, collection_name, stations_db=None, stations_collection=None):
+    """(records, station_names) from MongoDB; stations are read the way the backend does (sorted by SNO)"""
+    from pymongo import MongoClient
+
+    client = MongoClient(uri, serverSelectionTimeoutMS=2000)
+    fields = ["Assigned_Coach", "Assigned_berth", "Boarding_Station", "Deboarding_Station",
+              "PNR_Number", "PNR_Status"]
+    records = list(client[db_name][collection_name].find({}, {field: 1 for field in fields}))
+    station_names = None
+    if stations_collection:
+        station_docs = client[stations_db or db_name][stations_collection].find({}).sort("SNO", 1)
+        station_names = [s["Station_Name"] for s in station_docs]
+    return records, station_names
+
+
+# ----------------------------
+# SWEEP
+# ----------------------------
+def verify_intervals(intervals):
+    """Sweep every berth once and return a report dict"""
+    by_berth = defaultdict(list)
+    for coach, berth, start, end, label, is_rac in intervals:
+        by_berth[(coach, berth)].append((start, end, label, is_rac))
+
+    cnf_overlaps = []
+    rac_without_overlap = []
+    rac_single_occupant = []
+    valid_rac_pairs = 0
+
+    for (coach, berth), allocations in by_berth.items():
+        allocations.sort(key=lambda a: (a[0], a[1]))
+        active = []  # heap of (end, seq) for journeys still on the berth
+        rac_seqs = []  # RAC journeys on the berth in boarding order
+        partnered = set()  # RAC journeys that share the berth with another RAC journey
+
+        for seq, (start, end, label, is_rac) in enumerate(allocations):
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+
+            for _, other in active:
+                o_start, o_end, o_label, o_is_rac = allocations[other]
+                if is_rac and o_is_rac:
+                    valid_rac_pairs += 1
+                    partnered.update((seq, other))
+                else:
+                    cnf_overlaps.append({
+                        'coach': coach,
+                        'berth': berth,
+                        'passenger1': o_label,
+                        'passenger2': label,
+                        'overlap': (max(start, o_start), min(end, o_end))
+                    })
+
+            if is_rac:
+                rac_seqs.append(seq)
+
+            heapq.heappush(active, (end, seq))
+
+        if len(rac_seqs) == 1:
+            rac_single_occupant.append({'coach': coach, 'berth': berth, 'passenger': allocations[rac_seqs[0]][2]})
+            continue
+        for position, seq in enumerate(rac_seqs):
+            if seq not in partnered:
+                # Report it against the RAC journey just before it (or after it) on the berth
+                other = rac_seqs[position - 1] if position else rac_seqs[position + 1]
+                rac_without_overlap.append({
+                    'coach': coach,
+                    'berth': berth,
+                    'passenger1': allocations[other][2],
+                    'passenger2': allocations[seq][2]
+                })
+
+    return {
+        'berths': len(by_berth),
+        'allocations': len(intervals),
+        'cnf_overlaps': cnf_overlaps,
+        'valid_rac_pairs': valid_rac_pairs,
+        'rac_single_occupant': rac_single_occupant,
+        'rac_without_overlap': rac_without_overlap,
+        'ok': not (cnf_overlaps or rac_single_occupant or rac_without_overlap)
+    }
+
+
+def print_report(report, limit=5):
+    print(f"🔍 Verified {report['allocations']} allocations on {report['berths']} berths")
+    print(f"  Valid RAC Pairs (with overlap): {report['valid_rac_pairs']}")
+    print(f"  CNF Overlaps: {len(report['cnf_overlaps'])}")
+    for c in report['cnf_overlaps'][:limit]:
+        print(f"    ❌ COLLISION: {c['passenger1']} & {c['passenger2']} in {c['coach']}-{c['berth']} "
+              f"(stations {c['overlap'][0]}-{c['overlap'][1]})")
+    print(f"  RAC Berths with 1 passenger: {len(report['rac_single_occupant'])}")
+    for r in report['rac_single_occupant'][:limit]:
+        print(f"    ⚠️  SINGLE RAC: {r['passenger']} in {r['coach']}-{r['berth']}")
+    print(f"  RAC Without Overlap: {len(report['rac_without_overlap'])}")
+    for r in report['rac_without_overlap'][:limit]:
+        print(f"    ⚠️  RAC WITHOUT OVERLAP: {r['passenger1']} & {r['passenger2']} in {r['coach']}-{r['berth']}")
+    print(f"Result: {'✅ PASS' if report['ok'] else '❌ FAIL'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep-line collision check for a generated passenger manifest")
+    parser.add_argument("manifest", nargs="?", help="exported .json / .ndjson / .csv / .rman manifest")
+    parser.add_argument("--stations", help="station names in route order (.json list/docs or one name per line)")
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017/")
+    parser.add_argument("--mongo-db", help="passengers database, e.g. PassengersDB")
+    parser.add_argument("--mongo-collection", help="passengers collection, e.g. P_1 or L_1")
+    parser.add_argument("--stations-db", help="stations database (defaults to --mongo-db)")
+    parser.add_argument("--stations-collection", help="stations collection, sorted by SNO like the backend")
+    args = parser.parse_args(argv)
+
+    if args.manifest and args.manifest.endswith(".rman"):
+        from binary_manifest import BinaryManifest
+
+        report = verify_intervals(BinaryManifest(args.manifest).index().intervals())
+        print_report(report)
+        return 0 if report['ok'] else 1
+
+    station_names = load_station_names(args.stations) if args.stations else None
+    if args.mongo_collection:
+        records, mongo_stations = load_from_mongo(args.mongo_uri, args.mongo_db, args.mongo_collection,
+                                                  args.stations_db, args.stations_collection)
+        station_names = station_names or mongo_stations
+    elif args.manifest:
+        records = load_records(args.manifest)
+    else:
+        parser.error("give a manifest file or --mongo-db/--mongo-collection")
+    if not station_names:
+        parser.error("station order is required: --stations or --stations-collection")
+
+    report = verify_intervals(intervals_from_records(records, station_names))
+    print_report(report)
+    return 0 if report['ok'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
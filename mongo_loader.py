@@ -0,0 +1,203 @@
+# mongo_loader.py
+# HIGH-THROUGHPUT MONGODB BULK LOADER WITH ATOMIC COLLECTION SWAP
+# Documents are written as unordered insert_many chunks by a pool of writer threads
+# into a staging collection, the backend's passenger indexes are built there, and the
+# staging collection is then renamed over the live one (renameCollection with
+# dropTarget), so DataService.loadPassengers never sees an empty or half-written
+# collection.
+#
+# --sync instead diffs the manifest against the live collection by PNR_Number and
+# applies only the inserts, updates ($set of the changed fields, $unset of fields the
+# manifest does not have, e.g. selfCancelled or NO_show_timestamp written by the
+# backend) and deletes through chunked unordered bulk_write. The collection ends up
+# with the same documents a full load would give; unchanged documents and their index
+# entries are left alone.
+#
+# Usage (against a local mongod):
+#   python mongo_loader.py amaravati_correct_allocation.json --db PassengersDB --collection P_1
+#   python mongo_loader.py amaravati_correct_allocation.json --collection P_1 --sync
+#   python mongo_loader.py batch_manifest.ndjson --db rac --collection 17225_passengers \
+#       --batch-size 2000 --writers 8
+
+import argparse
+import itertools
+import json
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from pymongo import ASCENDING, DeleteMany, DeleteOne, IndexModel, InsertOne, MongoClient, UpdateOne
+
+DEFAULT_URI = "mongodb://localhost:27017/"
+
+# Same keys and names as backend/utils/create-indexes.js so the backend's own
+# createIndex calls are no-ops on a swapped-in collection
+PASSENGER_INDEXES = [
+    IndexModel([("PNR_Number", ASCENDING)], name="idx_pnr_number", unique=True),
+    IndexModel([("PNR_Status", ASCENDING)], name="idx_pnr_status"),
+    IndexModel([("Online_Status", ASCENDING)], name="idx_online_status"),
+    IndexModel([("PNR_Status", ASCENDING), ("Online_Status", ASCENDING), ("Boarded", ASCENDING)],
+               name="idx_reallocation_filter"),
+    IndexModel([("Train_Number", ASCENDING)], name="idx_train_number"),
+    IndexModel([("Coach_Number", ASCENDING)], name="idx_coach_number"),
+    IndexModel([("From_Station", ASCENDING), ("To_Station", ASCENDING)], name="idx_journey"),
+    IndexModel([("Boarded", ASCENDING)], name="idx_boarded"),
+    IndexModel([("NO_show", ASCENDING)], name="idx_no_show"),
+    IndexModel([("createdAt", ASCENDING)], name="idx_created_at", expireAfterSeconds=86400),
+]
+
+
+def _chunks(documents, batch_size):
+    iterator = iter(documents)
+    while True:
+        chunk = list(itertools.islice(iterator, batch_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def load_passengers(client, db_name, collection_name, documents, batch_size=1000, writers=4,
+                    indexes=PASSENGER_INDEXES):
+    """
+    Load documents into db_name.collection_name through a staging collection.
+    Returns a stats dict: inserted, seconds, docs_per_sec, staging.
+    """
+    db = client[db_name]
+    staging_name = f"{collection_name}__staging"
+    db.drop_collection(staging_name)
+    staging = db.create_collection(staging_name)
+
+    started = time.perf_counter()
+    inserted = 0
+    with ThreadPoolExecutor(max_workers=writers) as pool:
+        pending = set()
+        for chunk in _chunks(documents, batch_size):
+            # Keep a bounded number of chunks in flight so memory does not grow with the manifest
+            if len(pending) >= writers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                inserted += sum(len(f.result().inserted_ids) for f in done)
+            pending.add(pool.submit(staging.insert_many, chunk, ordered=False))
+        inserted += sum(len(f.result().inserted_ids) for f in pending)
+
+    if indexes:
+        staging.create_indexes(indexes)
+    staging.rename(collection_name, dropTarget=True)
+
+    seconds = time.perf_counter() - started
+    return {
+        'inserted': inserted,
+        'seconds': seconds,
+        'docs_per_sec': inserted / seconds if seconds > 0 else 0.0,
+        'staging': staging_name
+    }
+
+
+def sync_passengers(client, db_name, collection_name, documents, key="PNR_Number", batch_size=1000,
+                    indexes=PASSENGER_INDEXES):
+    """
+    Make db_name.collection_name hold documents by writing only the difference: new keys
+    are inserted, changed documents get a $set of the changed fields and an $unset of the
+    fields documents do not have, keys no longer in documents (and documents without
+    a key) are deleted. Returns a stats dict: inserted, updated, deleted, unchanged,
+    bulk_writes, seconds.
+    """
+    collection = client[db_name][collection_name]
+    if indexes:
+        collection.create_indexes(indexes)  # no-op when they exist; the key index serves the updates
+
+    started = time.perf_counter()
+    existing = {doc[key]: doc for doc in collection.find({key: {"$exists": True}}, {"_id": 0})}
+
+    operations = []
+    seen = set()
+    unchanged = 0
+    counts = {'inserted': 0, 'updated': 0, 'deleted': 0}
+    keyless = collection.count_documents({key: {"$exists": False}})
+    if keyless:
+        operations.append(DeleteMany({key: {"$exists": False}}))
+        counts['deleted'] += keyless
+    for doc in documents:
+        doc_key = doc[key]
+        if doc_key in seen:
+            raise ValueError(f"Duplicate {key} {doc_key!r} in the manifest")
+        seen.add(doc_key)
+        old = existing.get(doc_key)
+        if old is None:
+            operations.append(InsertOne(doc))
+            counts['inserted'] += 1
+            continue
+        changed = {field: value for field, value in doc.items()
+                   if field != "_id" and (field not in old or old[field] != value)}
+        removed = {field: "" for field in old if field not in doc}
+        if changed or removed:
+            update = {}
+            if changed:
+                update["$set"] = changed
+            if removed:
+                update["$unset"] = removed
+            operations.append(UpdateOne({key: doc_key}, update))
+            counts['updated'] += 1
+        else:
+            unchanged += 1
+    for doc_key in existing.keys() - seen:
+        operations.append(DeleteOne({key: doc_key}))
+        counts['deleted'] += 1
+
+    bulk_writes = 0
+    for chunk in _chunks(operations, batch_size):
+        collection.bulk_write(chunk, ordered=False)
+        bulk_writes += 1
+
+    return {
+        **counts,
+        'unchanged': unchanged,
+        'bulk_writes': bulk_writes,
+        'seconds': time.perf_counter() - started
+    }
+
+
+def sync_summary(stats):
+    """One-line per-operation count summary of a sync_passengers() result"""
+    return (f"{stats['inserted']} inserted, {stats['updated']} updated, {stats['deleted']} deleted, "
+            f"{stats['unchanged']} unchanged ({stats['bulk_writes']} bulk writes, {stats['seconds']:.2f}s)")
+
+
+def iter_documents(path):
+    """Stream documents from a .ndjson/.jsonl file, or load a .json array"""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".ndjson", ".jsonl")):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-load a passenger manifest and swap it in atomically, "
+                                                 "or sync only the differences")
+    parser.add_argument("manifest", help="exported .json array or .ndjson manifest")
+    parser.add_argument("--uri", default=DEFAULT_URI)
+    parser.add_argument("--db", default="PassengersDB")
+    parser.add_argument("--collection", default="P_1")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--sync", action="store_true",
+                        help="diff against the live collection by PNR_Number and write only the changes")
+    args = parser.parse_args(argv)
+
+    client = MongoClient(args.uri, serverSelectionTimeoutMS=2000)
+    if args.sync:
+        stats = sync_passengers(client, args.db, args.collection, iter_documents(args.manifest),
+                                batch_size=args.batch_size)
+        print(f"✅ Synced {args.db}.{args.collection}: {sync_summary(stats)}")
+        return 0
+    stats = load_passengers(client, args.db, args.collection, iter_documents(args.manifest),
+                            batch_size=args.batch_size, writers=args.writers)
+    print(f"✅ Loaded {stats['inserted']} documents into {args.db}.{args.collection} "
+          f"in {stats['seconds']:.2f}s ({stats['docs_per_sec']:.0f} docs/sec)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+# occupancy_matrix.py
+# NUMPY OCCUPANCY MODEL: berths x segments matrix + per-station boarding/alighting deltas
+# Segment s is the stretch between station s and station s+1. A cell holds how many
+# passengers sit on that berth over that segment (2 for a shared RAC berth), so the
+# whole-train views (onboard per station, peak, per-coach / per-class utilisation)
+# are single cumsum / reduction calls instead of per-passenger Python loops.
+
+import numpy as np
+
+
+class OccupancyMatrix:
+    def __init__(self, station_names, coaches_by_class, berth_maps):
+        """
+        station_names: station names in route order
+        coaches_by_class: {"Sleeper": ["S1", ...], "AC_3_Tier": ["B1", ...]}
+        berth_maps: {"Sleeper": sleeper_berths, "AC_3_Tier": ac_berths}
+        """
+        self.station_names = list(station_names)
+        self.station_index = {name: i for i, name in enumerate(self.station_names)}
+        self.num_stations = len(self.station_names)
+        self.num_segments = self.num_stations - 1
+
+        self.coaches = []
+        self.classes = list(coaches_by_class)
+        self.berth_types = []
+        self.berth_row = {}  # (coach, berth) -> matrix row
+        row_coach = []
+        row_class = []
+        row_berth = []
+        row_type = []
+        for class_id, (coach_class, coaches) in enumerate(coaches_by_class.items()):
+            berth_type_of = {b: berth_type for berth_type, berths in berth_maps[coach_class].items() for b in berths}
+            for berth_type in berth_type_of.values():
+                if berth_type not in self.berth_types:
+                    self.berth_types.append(berth_type)
+            berth_numbers = sorted(berth_type_of)
+            for coach in coaches:
+                coach_id = len(self.coaches)
+                self.coaches.append(coach)
+                for berth in berth_numbers:
+                    self.berth_row[(coach, berth)] = len(row_coach)
+                    row_coach.append(coach_id)
+                    row_class.append(class_id)
+                    row_berth.append(berth)
+                    row_type.append(self.berth_types.index(berth_type_of[berth]))
+        self.row_coach = np.array(row_coach, dtype=np.int32)
+        self.row_class = np.array(row_class, dtype=np.int32)
+        self.row_berth = np.array(row_berth, dtype=np.int16)
+        self.row_type = np.array(row_type, dtype=np.int8)
+
+        self.matrix = np.zeros((len(self.berth_row), self.num_segments), dtype=np.uint8)
+        self.boarding = np.zeros(self.num_stations, dtype=np.int64)
+        self.alighting = np.zeros(self.num_stations, dtype=np.int64)
+
+    def add_journeys(self, coaches, berths, boards, alights):
+        """
+        Add many journeys at once (parallel sequences of coach, berth, board index,
+        alight index). Berth occupancy is built as a difference array per berth and
+        integrated with a single cumsum along the segment axis.
+        """
+        rows = np.fromiter((self.berth_row[key] for key in zip(coaches, berths)), dtype=np.int64)
+        boards = np.asarray(boards, dtype=np.int64)
+        alights = np.asarray(alights, dtype=np.int64)
+        if rows.size == 0:
+            return
+
+        diff = np.zeros((self.matrix.shape[0], self.num_stations), dtype=np.int16)
+        np.add.at(diff, (rows, boards), 1)
+        np.add.at(diff, (rows, alights), -1)
+        self.matrix += np.cumsum(diff, axis=1)[:, :self.num_segments].astype(np.uint8)
+
+        self.boarding += np.bincount(boards, minlength=self.num_stations)
+        self.alighting += np.bincount(alights, minlength=self.num_stations)
+
+    def add_passengers(self, passengers):
+        """Add every berth-holding passenger record (WL passengers are skipped)"""
+        allocated = [p for p in passengers if p["Assigned_Coach"] != "WL"]
+        self.add_journeys(
+            [p["Assigned_Coach"] for p in allocated],
+            [p["Assigned_berth"] for p in allocated],
+            [self.station_index[p["Boarding_Station"]] for p in allocated],
+            [self.station_index[p["Deboarding_Station"]] for p in allocated]
+        )
+
+    def add_table(self, table):
+        """Add every berth-holding passenger of a PassengerTable (WL passengers are skipped)"""
+        rows = np.flatnonzero(~table.mask("Assigned_Coach", "WL"))
+        coach_names = table.coach.values
+        self.add_journeys(
+            [coach_names[code] for code in table.column("Assigned_Coach")[rows].tolist()],
+            table.column("Assigned_berth")[rows].tolist(),
+            table.column("Boarding_Station")[rows],
+            table.column("Deboarding_Station")[rows]
+        )
+
+    def onboard_counts(self):
+        """Passengers onboard after departing each station (0 at the terminus)"""
+        return np.cumsum(self.boarding - self.alighting)
+
+    def peak(self):
+        """(peak onboard count, station index where it is reached)"""
+        onboard = self.onboard_counts()
+        peak_idx = int(np.argmax(onboard))
+        return int(onboard[peak_idx]), peak_idx
+
+    def occupied_berths_per_segment(self):
+        """Number of physical berths in use on each segment"""
+        return np.count_nonzero(self.matrix, axis=0)
+
+    def vacant_ranges(self):
+        """
+        Every maximal vacant stretch of every berth as parallel arrays (rows, starts, ends):
+        berth row r is empty over segments [start, end), i.e. from station start to station
+        end. Found for all berths at once from the edges of the zero mask.
+        """
+        padded = np.zeros((self.matrix.shape[0], self.num_segments + 2), dtype=np.int8)
+        padded[:, 1:-1] = self.matrix == 0
+        edges = np.diff(padded, axis=1)
+        # Row-major order: the k-th rising edge and the k-th falling edge are the same range
+        rows, starts = np.nonzero(edges == 1)
+        _, ends = np.nonzero(edges == -1)
+        return rows, starts, ends
+
+    def coach_utilisation(self):
+        """{coach: fraction of that coach's berth-segments that are occupied}"""
+        used = np.bincount(self.row_coach, weights=np.count_nonzero(self.matrix, axis=1),
+                           minlength=len(self.coaches))
+        capacity = np.bincount(self.row_coach, minlength=len(self.coaches)) * self.num_segments
+        return dict(zip(self.coaches, (used / capacity).tolist()))
+
+    def class_utilisation(self):
+        """{class: fraction of that class's berth-segments that are occupied}"""
+        used = np.bincount(self.row_class, weights=np.count_nonzero(self.matrix, axis=1),
+                           minlength=len(self.classes))
+        capacity = np.bincount(self.row_class, minlength=len(self.classes)) * self.num_segments
+        return dict(zip(self.classes, (used / capacity).tolist()))
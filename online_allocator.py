@@ -0,0 +1,251 @@
+# online_allocator.py
+# INCREMENTAL (ONLINE) ALLOCATION ENGINE
+# The generators allocate a whole manifest in one pass; this engine keeps the result
+# live so journeys can be cancelled, cut short by a no-show or moved by a RAC upgrade,
+# and answers "which berths are vacant at this station, and until where" without
+# rescanning every berth (what TrainState.getVacantBerths / _findAllVacantRanges do in
+# the backend). It is a reference engine for simulating and validating reallocation.
+#
+# Per berth it keeps how many CNF / RAC passengers hold each segment and a sorted list
+# of vacant ranges; per segment a bitset of the berths vacant on it. A booking, cancel,
+# no-show or upgrade is a dict lookup, a bisect in one berth's vacant list and one
+# update per segment of the stretch that changed, so O(route length) per operation
+# however large the manifest is; vacant_ranges(station) reads the segment bitset and
+# bisects the vacant list of each berth it names.
+#
+#   engine = OnlineAllocator.from_table(manifest.passengers, manifest.coaches_by_class, manifest.berth_maps)
+#   engine.mark_no_show("1000000042", station=7)
+#   for vacancy in engine.vacant_ranges(7): ...
+#   engine.upgrade_rac("1000000003", ("S4", 12), station=7)
+
+import bisect
+from collections import namedtuple
+
+from passenger_table import PNR_STATUSES
+
+# One stretch of a passenger's journey on one berth (a RAC upgrade adds a second leg)
+Leg = namedtuple("Leg", "coach berth start end status")
+
+
+class OnlineAllocator:
+    def __init__(self, num_stations, coaches_by_class, berth_maps):
+        self.num_segments = num_stations - 1
+        # bit -> (coach_class, coach, berth, berth_type); coach by coach in berth-number order
+        self.berth_info = []
+        for coach_class, coaches in coaches_by_class.items():
+            berth_types = {berth: berth_type
+                           for berth_type, berth_numbers in berth_maps[coach_class].items()
+                           for berth in berth_numbers}
+            for coach in coaches:
+                for berth in sorted(berth_types):
+                    self.berth_info.append((coach_class, coach, berth, berth_types[berth]))
+        self.berth_ids = {(coach, berth): bit for bit, (_, coach, berth, _) in enumerate(self.berth_info)}
+        self.cnf_count = [[0] * self.num_segments for _ in self.berth_info]
+        self.rac_count = [[0] * self.num_segments for _ in self.berth_info]
+        self.vacant = [[(0, self.num_segments)] if self.num_segments else [] for _ in self.berth_info]
+        self.vacant_at = [(1 << len(self.berth_info)) - 1] * self.num_segments
+        self.legs = {}  # pid -> [Leg, ...]
+        self.no_shows = {}  # pid -> station the passenger was marked NO_SHOW at
+
+    @classmethod
+    def from_table(cls, table, coaches_by_class, berth_maps):
+        """Engine holding every CNF / RAC passenger of a PassengerTable, keyed by PNR_Number"""
+        engine = cls(len(table.station_names), coaches_by_class, berth_maps)
+        wl_code = PNR_STATUSES.index("WL")
+        for row, status in enumerate(table.pnr_status):
+            if status == wl_code:
+                continue
+            engine.book(str(table.pnr[row]), table.coach[row], table.berth[row],
+                        table.board[row], table.alight[row], PNR_STATUSES[status])
+        return engine
+
+    # ----------------------------
+    # SEGMENT BOOKKEEPING
+    # ----------------------------
+    def _bit(self, coach, berth):
+        try:
+            return self.berth_ids[(coach, berth)]
+        except KeyError:
+            raise ValueError(f"Unknown berth {coach}-{berth}") from None
+
+    def _runs(self, segments):
+        """Contiguous [start, end) runs of a sorted list of segment numbers"""
+        runs = []
+        for segment in segments:
+            if runs and runs[-1][1] == segment:
+                runs[-1][1] += 1
+            else:
+                runs.append([segment, segment + 1])
+        return runs
+
+    def _take(self, bit, start, end):
+        """Remove [start, end) (entirely vacant) from the berth's vacant ranges"""
+        ranges = self.vacant[bit]
+        k = bisect.bisect_right(ranges, (start, self.num_segments)) - 1
+        v_start, v_end = ranges[k]
+        ranges[k:k + 1] = [r for r in ((v_start, start), (end, v_end)) if r[0] < r[1]]
+        clear = ~(1 << bit)
+        for segment in range(start, end):
+            self.vacant_at[segment] &= clear
+
+    def _give(self, bit, start, end):
+        """Add [start, end) (just vacated) to the berth's vacant ranges, merging neighbours"""
+        ranges = self.vacant[bit]
+        k = bisect.bisect_left(ranges, (start, start))
+        if k < len(ranges) and ranges[k][0] == end:
+            end = ranges.pop(k)[1]
+        if k > 0 and ranges[k - 1][1] == start:
+            k -= 1
+            start = ranges.pop(k)[0]
+        ranges.insert(k, (start, end))
+        for segment in range(start, end):
+            self.vacant_at[segment] |= 1 << bit
+
+    def _occupy(self, bit, start, end, status):
+        counts = self.rac_count[bit] if status == "RAC" else self.cnf_count[bit]
+        cnf, rac = self.cnf_count[bit], self.rac_count[bit]
+        newly_taken = [s for s in range(start, end) if not cnf[s] and not rac[s]]
+        for segment in range(start, end):
+            counts[segment] += 1
+        for run_start, run_end in self._runs(newly_taken):
+            self._take(bit, run_start, run_end)
+
+    def _release(self, bit, start, end, status):
+        counts = self.rac_count[bit] if status == "RAC" else self.cnf_count[bit]
+        cnf, rac = self.cnf_count[bit], self.rac_count[bit]
+        for segment in range(start, end):
+            counts[segment] -= 1
+        for run_start, run_end in self._runs([s for s in range(start, end) if not cnf[s] and not rac[s]]):
+            self._give(bit, run_start, run_end)
+
+    def _check_free(self, bit, start, end, status):
+        """CNF needs the berth to itself; RAC may share it with one other RAC passenger"""
+        cnf, rac = self.cnf_count[bit], self.rac_count[bit]
+        for segment in range(start, end):
+            if cnf[segment] or (rac[segment] if status == "CNF" else rac[segment] >= 2):
+                coach_class, coach, berth, _ = self.berth_info[bit]
+                raise ValueError(f"{coach}-{berth} is not free for {status} on segment {segment}")
+
+    # ----------------------------
+    # OPERATIONS
+    # ----------------------------
+    def book(self, pid, coach, berth, start, end, status="CNF"):
+        """Seat a passenger on (coach, berth) over [start, end); status "CNF" or "RAC" (Side Lower share)"""
+        if pid in self.legs:
+            raise ValueError(f"Passenger {pid} is already booked")
+        if not 0 <= start < end <= self.num_segments:
+            raise ValueError(f"Invalid journey {start} -> {end}")
+        bit = self._bit(coach, berth)
+        self._check_free(bit, start, end, status)
+        self._occupy(bit, start, end, status)
+        self.legs[pid] = [Leg(coach, berth, start, end, status)]
+
+    def _legs(self, pid):
+        try:
+            return self.legs[pid]
+        except KeyError:
+            raise KeyError(f"Passenger {pid} not found") from None
+
+    def cancel(self, pid):
+        """Drop a booking entirely; returns the (coach, berth, start, end) stretches it vacated"""
+        freed = []
+        for leg in self._legs(pid):
+            self._release(self._bit(leg.coach, leg.berth), leg.start, leg.end, leg.status)
+            freed.append((leg.coach, leg.berth, leg.start, leg.end))
+        del self.legs[pid]
+        self.no_shows.pop(pid, None)
+        return freed
+
+    def mark_no_show(self, pid, station):
+        """
+        The passenger did not turn up by station: every berth they hold from there to their
+        deboarding station is vacated (all of it when station is at or before boarding; the
+        passenger stays known, with no legs). Returns the freed (coach, berth, start, end)
+        stretches in journey order, [] when nothing was left to free.
+        """
+        legs = self._legs(pid)
+        freed = []
+        # Legs that start at or after the station are dropped whole, the one running through it is cut
+        while legs and legs[-1].end > station:
+            leg = legs.pop()
+            start = max(leg.start, station)
+            self._release(self._bit(leg.coach, leg.berth), start, leg.end, leg.status)
+            freed.append((leg.coach, leg.berth, start, leg.end))
+            if start > leg.start:
+                legs.append(leg._replace(end=start))
+        if freed:
+            self.no_shows[pid] = station
+        freed.reverse()
+        return freed
+
+    def upgrade_rac(self, pid, berth, station=None):
+        """
+        Move a RAC passenger to a berth of their own from station (default: their boarding
+        station) to the end of their journey. berth is (coach, berth number) or "S4-12".
+        The co-passenger keeps the Side Lower. Returns the new Leg.
+        """
+        if isinstance(berth, str):
+            coach, number = berth.rsplit("-", 1)
+            berth = (coach, int(number))
+        legs = self._legs(pid)
+        if not legs or legs[-1].status != "RAC":
+            raise ValueError(f"Passenger {pid} is not travelling RAC")
+        leg = legs[-1]
+        start = leg.start if station is None else max(station, leg.start)
+        if start >= leg.end:
+            raise ValueError(f"Passenger {pid} has already deboarded by station {start}")
+        bit = self._bit(*berth)
+        self._check_free(bit, start, leg.end, "CNF")
+
+        self._release(self._bit(leg.coach, leg.berth), start, leg.end, "RAC")
+        if start > leg.start:
+            legs[-1] = leg._replace(end=start)
+        else:
+            legs.pop()
+        upgraded = Leg(berth[0], berth[1], start, leg.end, "CNF")
+        self._occupy(bit, start, leg.end, "CNF")
+        legs.append(upgraded)
+        return upgraded
+
+    # ----------------------------
+    # QUERIES
+    # ----------------------------
+    def vacant_ranges(self, station):
+        """
+        Every berth vacant on the segment leaving station, with the whole vacant stretch around
+        it: [{'coach', 'berth', 'berth_type', 'class', 'vacant_from', 'vacant_to'}] in berth order.
+        """
+        if not 0 <= station < self.num_segments:
+            return []
+        vacancies = []
+        bits = self.vacant_at[station]
+        while bits:
+            low = bits & -bits
+            bit = low.bit_length() - 1
+            bits ^= low
+            ranges = self.vacant[bit]
+            v_start, v_end = ranges[bisect.bisect_right(ranges, (station, self.num_segments)) - 1]
+            coach_class, coach, berth, berth_type = self.berth_info[bit]
+            vacancies.append({
+                'coach': coach,
+                'berth': berth,
+                'berth_type': berth_type,
+                'class': coach_class,
+                'vacant_from': v_start,
+                'vacant_to': v_end
+            })
+        return vacancies
+
+    def berth_vacancies(self, coach, berth):
+        """All vacant [start, end) stretches of one berth (the backend's _findAllVacantRanges)"""
+        return list(self.vacant[self._bit(coach, berth)])
+
+    def journey(self, pid):
+        """Current legs of a passenger"""
+        return list(self._legs(pid))
+
+    def __len__(self):
+        return len(self.legs)
+
+    def __contains__(self, pid):
+        return pid in self.legs
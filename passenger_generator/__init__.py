@@ -0,0 +1,36 @@
+# passenger_generator
+# PASSENGER MANIFEST GENERATOR PACKAGE
+# Importing the package does no work: the allocators, numpy and the name pools are only
+# loaded when generate() / report() / Manifest are first used.
+#
+#   from passenger_generator import generate
+#   manifest = generate({"algorithm": "correct"}, seed=20251116)
+#
+# python -m passenger_generator is the command-line interface (see __main__.py).
+
+_EXPORTS = {
+    "DEFAULT_CONFIG": "api",
+    "DEFAULT_SEED": "api",
+    "ALGORITHMS": "api",
+    "CNF_MODES": "api",
+    "RNG_MODES": "api",
+    "generate": "api",
+    "report": "api",
+    "resolve_config": "api",
+    "Manifest": "manifest",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,78 @@
+# passenger_generator/__main__.py
+# Thin command line over generate(): one manifest per run, exported through
+# manifest_exporters.
+#
+# Usage:
+#   python -m passenger_generator --algorithm optimized --seed 7 --output l_1.ndjson
+#   python -m passenger_generator --date 16-11-2025 --output p_1.csv --compression gzip --quiet
+#   python -m passenger_generator --output p_1.rman    # fixed-width binary, see binary_manifest.py
+#   python -m passenger_generator --rng counter --date 16-11-2025 --output p_1.ndjson
+#   python -m passenger_generator --algorithm optimized --cache .allocation_cache --output l_1.ndjson
+#   python -m passenger_generator --quiet --metrics metrics.json --profile cprofile
+
+import argparse
+import sys
+
+from generation_metrics import GenerationMetrics, profiled
+from manifest_exporters import open_exporter
+from phase_cache import PhaseCache
+
+from .api import ALGORITHMS, CNF_MODES, DEFAULT_CONFIG, DEFAULT_SEED, RNG_MODES, generate, report
+from .layout import quiet
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m passenger_generator",
+                                     description="Generate one passenger manifest")
+    parser.add_argument("--algorithm", choices=sorted(ALGORITHMS), default=DEFAULT_CONFIG["algorithm"])
+    parser.add_argument("--cnf-mode", choices=CNF_MODES, default=DEFAULT_CONFIG["cnf_mode"],
+                        help="CNF berth assignment: first-fit in berth order or interval scheduling")
+    parser.add_argument("--rng", choices=RNG_MODES, default=DEFAULT_CONFIG["rng"],
+                        help="one sequential random stream, or counter-based draws keyed per passenger slot")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--train", default=DEFAULT_CONFIG["train_number"], help="train number")
+    parser.add_argument("--date", default=DEFAULT_CONFIG["journey_date"], help="journey date (DD-MM-YYYY)")
+    parser.add_argument("--output", action="append", default=[],
+                        help="export file (csv / json / ndjson / parquet / rman by extension); repeatable")
+    parser.add_argument("--format", help="export format when it cannot be taken from the extension")
+    parser.add_argument("--compression", choices=["gzip", "zstd"])
+    parser.add_argument("--quiet", action="store_true", help="no progress output or report")
+    parser.add_argument("--cache", help="phase cache directory (optimized: reuse unchanged allocation phases)")
+    parser.add_argument("--metrics", help="write phase timings, probes, failures and RNG draws as JSON")
+    parser.add_argument("--profile", choices=["cprofile", "pyinstrument"], help="profile generation")
+    parser.add_argument("--profile-output", help="profile file (default: generate.prof / generate.html)")
+    args = parser.parse_args(argv)
+
+    config = {"algorithm": args.algorithm, "cnf_mode": args.cnf_mode, "rng": args.rng, "train_number": args.train,
+              "journey_date": args.date}
+    # Binary manifests need the finished table (header dictionaries, string heap); the rest stream
+    binary_outputs = [path for path in args.output if (args.format or path.rsplit(".", 1)[-1]) == "rman"]
+    exporters = {path: open_exporter(path, args.format, args.compression)
+                 for path in args.output if path not in binary_outputs}
+    log = quiet if args.quiet else print
+
+    metrics = GenerationMetrics()
+    profile_output = args.profile_output or ("generate.prof" if args.profile == "cprofile" else "generate.html")
+    with profiled(args.profile, profile_output):
+        manifest = generate(config, args.seed, log=log, sinks=list(exporters.values()), metrics=metrics,
+                            cache=PhaseCache(args.cache) if args.cache else None)
+    metrics.phase("report")
+    report(manifest, log=log)
+    metrics.phase("export")
+    for path, exporter in exporters.items():
+        exporter.close()
+        log(f"✅ Exported: {path}")
+    for path in binary_outputs:
+        manifest.write_binary(path)
+        log(f"✅ Exported: {path}")
+    metrics.stop()
+    if args.profile:
+        log(f"✅ Profile: {profile_output}")
+    if args.metrics:
+        metrics.write(args.metrics, seed=args.seed, config=manifest.config)
+        log(f"✅ Metrics: {args.metrics}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
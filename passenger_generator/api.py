@@ -0,0 +1,84 @@
+# passenger_generator/api.py
+# IN-PROCESS GENERATION API
+# generate(config, seed) runs one allocator on one train-date and returns a Manifest;
+# nothing is printed, exported or written to MongoDB unless the caller asks for it
+# (log=print, sinks=[exporters]), so a seeding service can build hundreds of datasets
+# in one process without going through the scripts.
+#
+#   from passenger_generator import generate
+#   manifest = generate({"algorithm": "optimized", "journey_date": "16-11-2025"}, seed=7)
+#   docs = list(manifest.records())
+
+from importlib import import_module
+
+from .layout import quiet
+
+DEFAULT_CONFIG = {
+    "algorithm": "correct",  # "correct" (passengers_data.py) or "optimized" (test.py)
+    "train_number": "17225",
+    "train_name": "Amaravati Express",
+    "journey_date": "15-11-2025",
+    "sleeper_coaches": 9,
+    "ac_coaches": 2,
+    "passenger_scale": 1.0,  # demand relative to the default train
+    "extra_stations": 0,  # extension halts beyond Hubballi
+    "cnf_mode": "first_fit",  # "first_fit" (berth order) or "interval" (cnf_scheduler.py)
+    "rng": "sequential",  # "sequential" (one random.Random) or "counter" (counter_rng.py, keyed per slot)
+    "id_offset": 0,  # added to the first IRCTC sequence and PNR (batch shards get disjoint ranges)
+    "journey_mix": (0.40, 0.35, 0.25),  # optimized: short/medium/long split of the phase-2 fill
+    "debug_cross_check": False,  # optimized: verify every bitmask answer against the interval lists
+}
+DEFAULT_SEED = 20251116
+
+CNF_MODES = ("first_fit", "interval")
+RNG_MODES = ("sequential", "counter")
+
+# algorithm name -> module with generate(config, seed, log, sinks, metrics) and report(manifest, log)
+ALGORITHMS = {
+    "correct": "passenger_generator.correct",
+    "optimized": "passenger_generator.optimized",
+}
+
+
+def resolve_config(config=None):
+    """DEFAULT_CONFIG updated with config; unknown keys and algorithms are rejected"""
+    config = dict(config or {})
+    unknown = set(config) - set(DEFAULT_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown config keys: {', '.join(sorted(unknown))}")
+    resolved = {**DEFAULT_CONFIG, **config}
+    if resolved["algorithm"] not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm {resolved['algorithm']!r} (choose from {', '.join(ALGORITHMS)})")
+    if resolved["cnf_mode"] not in CNF_MODES:
+        raise ValueError(f"Unknown cnf_mode {resolved['cnf_mode']!r} (choose from {', '.join(CNF_MODES)})")
+    if resolved["rng"] not in RNG_MODES:
+        raise ValueError(f"Unknown rng {resolved['rng']!r} (choose from {', '.join(RNG_MODES)})")
+    if resolved["id_offset"] < 0:
+        raise ValueError(f"id_offset must be >= 0, got {resolved['id_offset']}")
+    return resolved
+
+
+def _algorithm(name):
+    return import_module(ALGORITHMS[name])
+
+
+def generate(config=None, seed=DEFAULT_SEED, log=quiet, sinks=(), metrics=None, cache=None):
+    """
+    Generate one manifest. config overrides DEFAULT_CONFIG; the same (config, seed) always
+    gives the same manifest. log receives the progress lines the scripts print, sinks
+    (manifest_exporters) receive records in FILL_CHUNK batches while allocation runs, metrics
+    (generation_metrics.GenerationMetrics, a fresh one by default) ends up as manifest.metrics.
+    cache (phase_cache.PhaseCache) lets an algorithm with CACHED_PHASES reuse phases of earlier runs.
+    """
+    config = resolve_config(config)
+    module = _algorithm(config["algorithm"])
+    if cache is None:
+        return module.generate(config, seed, log=log, sinks=sinks, metrics=metrics)
+    if not getattr(module, "CACHED_PHASES", ()):
+        raise ValueError(f"The {config['algorithm']} algorithm has no cached phases")
+    return module.generate(config, seed, log=log, sinks=sinks, metrics=metrics, cache=cache)
+
+
+def report(manifest, log=print):
+    """Verification and analysis report of a manifest (what the scripts print after allocation)"""
+    _algorithm(manifest.config["algorithm"]).report(manifest, log=log)
@@ -0,0 +1,590 @@
+# passenger_generator/correct.py
+# CORRECT RAC LOGIC: RAC = 2 passengers sharing ONE Side Lower berth
+# CORRECT CNF LOGIC: Single passenger per berth, no overlaps allowed
+# COLLISION-FREE BERTH ALLOCATION: No overlapping journeys on same berth
+# (the "correct" algorithm; passengers_data.py is its command-line wrapper)
+
+import copy
+import random
+from collections import defaultdict
+
+from attribute_synthesis import FILL_CHUNK, AttributeSynthesizer
+from berth_index import FreeBerthIndex
+from cnf_scheduler import IntervalScheduler, first_fit
+from counter_rng import CounterRNG, SequentialDraws
+from fenwick_sampler import FenwickSampler
+from generation_metrics import GenerationMetrics
+from passenger_table import PassengerTable
+from rac_pairing import match_overlapping, pack_pairs, pair_span
+
+from .layout import (BERTH_MAPS, FIRST_NAMES, LAST_NAMES, MIDDLE_NAMES, berth_capacity, coach_names,
+                     quiet, side_lower_berths)
+from .manifest import Manifest
+
+RAC_TARGET = 136  # EVEN NUMBER: 68 berths × 2 passengers = 136 RAC
+MAX_ONBOARD_CAPACITY = 823
+
+# ----------------------------
+# STATIONS (CORRECTED NAMES): (name, boarding count, alighting count)
+# ----------------------------
+STATIONS = [
+    ("Narasapur", 195, 0),
+    ("Palakollu", 98, 11),
+    ("Bhimavaram Jn", 76, 22),
+    ("Bhimavaram Town", 74, 6),
+    ("Akividu", 33, 11),
+    ("Kaikolur", 44, 6),
+    ("Gudivada Jn", 66, 22),
+    ("Vijayawada Jn", 198, 89),
+    ("Guntur Jn", 132, 66),
+    ("Narasaraopet (NR)", 33, 11),
+    ("Vinukonda", 27, 11),
+    ("Kurichedu", 16, 11),
+    ("Donakonda", 11, 22),
+    ("Markapur Road", 39, 11),
+    ("Cumbum", 11, 11),
+    ("Giddalur", 11, 17),
+    ("Nandyal", 44, 33),
+    ("Dhone Jn", 39, 44),
+    ("Pendekallu", 18, 11),
+    ("Guntakal Jn", 94, 111),
+    ("Bellary Jn", 74, 66),
+    ("Toranagallu Jn", 27, 33),
+    ("Hosapete Jn", 39, 66),
+    ("Munirabad", 20, 23),
+    ("Koppal", 27, 44),
+    ("Gadag Jn", 39, 111),
+    ("Annigeri", 20, 56),
+    ("Hubballi Jn", 0, 579)
+]
+
+
+def build_stations(extra_stations=0, passenger_scale=1):
+    """
+    Route for one run. Benchmark scenarios: extension halts beyond Hubballi reuse the
+    intermediate stations' boarding/alighting profile, then every count is scaled by
+    passenger_scale.
+    """
+    stations = list(STATIONS)
+    for i in range(extra_stations):
+        _, b_cnt, a_cnt = stations[1 + i % 26]
+        stations.append((f"Extension Halt {i + 1}", b_cnt if i < extra_stations - 1 else 0, a_cnt))
+    if passenger_scale != 1:
+        stations = [(name, round(b_cnt * passenger_scale), round(a_cnt * passenger_scale))
+                    for name, b_cnt, a_cnt in stations]
+    return stations
+
+
+# ----------------------------
+# CORRECT BERTH ALLOCATOR
+# ----------------------------
+class CorrectAllocator:
+    def __init__(self):
+        # Track ALL berth allocations: (coach, berth) → [(start, end, passenger_id, is_rac)]
+        self.allocations = defaultdict(list)
+        # Track RAC pairs specifically: (coach, berth) → [passenger_ids]
+        self.rac_pairs = defaultdict(list)
+    
+    def is_berth_available_for_cnf(self, coach, berth, start, end, passenger_id=None):
+        """Check if berth is available for CNF passenger - NO overlaps allowed"""
+        for alloc_start, alloc_end, alloc_pid, alloc_is_rac in self.allocations[(coach, berth)]:
+            # Skip checking against self
+            if passenger_id == alloc_pid:
+                continue
+                
+            # STRICT CHECK for CNF: No overlap allowed at all
+            if start < alloc_end and end > alloc_start:
+                return False  # Collision detected
+        return True
+    
+    def can_add_rac_pair(self, coach, berth, start1, end1, pid1, start2, end2, pid2):
+        """Check if two passengers can share this side lower berth as RAC pair"""
+        # A berth holds one RAC pair at a time: a later pair may reuse it once the earlier
+        # pair has alighted, which the collision check below enforces
+        # For RAC pairs, they MUST have overlapping journeys to share
+        if end1 <= start2 or start1 >= end2:
+            return False  # No overlap = can't share as RAC pair
+        
+        # Check if both passengers can be accommodated without collisions with existing passengers
+        for alloc_start, alloc_end, alloc_pid, alloc_is_rac in self.allocations[(coach, berth)]:
+            # Check passenger1 against existing
+            if pid1 != alloc_pid and start1 < alloc_end and end1 > alloc_start:
+                return False
+            # Check passenger2 against existing  
+            if pid2 != alloc_pid and start2 < alloc_end and end2 > alloc_start:
+                return False
+        
+        return True
+    
+    def add_cnf_passenger(self, coach, berth, start, end, passenger_id, berth_type):
+        """Add CNF passenger with exclusive berth access"""
+        if not self.is_berth_available_for_cnf(coach, berth, start, end, passenger_id):
+            return False
+        
+        self.allocations[(coach, berth)].append((start, end, passenger_id, False))
+        return True
+    
+    def add_rac_pair(self, coach, berth, start1, end1, pid1, start2, end2, pid2):
+        """Add two RAC passengers sharing one side lower berth"""
+        if not self.can_add_rac_pair(coach, berth, start1, end1, pid1, start2, end2, pid2):
+            return False
+        
+        # Add both passengers to allocations
+        self.allocations[(coach, berth)].extend([
+            (start1, end1, pid1, True),
+            (start2, end2, pid2, True)
+        ])
+        
+        # Track as RAC pair
+        self.rac_pairs[(coach, berth)].extend([pid1, pid2])
+        
+        return len(self.rac_pairs[(coach, berth)])
+
+
+def generate(config, seed, log=quiet, sinks=(), metrics=None):
+    """Allocate one train-date with the CorrectAllocator rules; returns a Manifest"""
+    if metrics is None:
+        metrics = GenerationMetrics()
+    metrics.phase("setup")
+    rng = random.Random(seed)
+    # Every draw goes through draws: the shared rng in order, or keyed by (stream, slot)
+    keyed = CounterRNG(seed, config["train_number"], config["journey_date"]) if config["rng"] == "counter" else None
+    draws = keyed or SequentialDraws(rng)
+    passenger_scale = config["passenger_scale"]
+    total_target = round(1500 * passenger_scale)
+    cnf_target = total_target - RAC_TARGET
+
+    log("="*80)
+    log("🚂 AMARAVATI EXPRESS - CORRECT ALLOCATION LOGIC")
+    log("="*80)
+    log(f"RAC Logic: 2 passengers share 1 Side Lower berth = BOTH become RAC")
+    log(f"CNF Logic: 1 passenger per berth, no journey overlaps")
+    log(f"Target: {total_target} passengers ({cnf_target} CNF + {RAC_TARGET} RAC)")
+    log("="*80 + "\n")
+
+    stations = build_stations(config["extra_stations"], passenger_scale)
+    num_stations = len(stations)
+
+    # Calculate total berth capacity
+    total_sleeper_berths, total_ac_berths = berth_capacity(config["sleeper_coaches"], config["ac_coaches"])
+    total_berths = total_sleeper_berths + total_ac_berths
+
+    log(f"📊 CAPACITY ANALYSIS:")
+    log(f"  Total Sleeper Berths: {total_sleeper_berths}")
+    log(f"  Total AC_3_Tier Berths: {total_ac_berths}")
+    log(f"  Total Berths Available: {total_berths}")
+    log(f"  Passengers to Allocate: {total_target}")
+    log(f"  Capacity Utilization: {(total_target/total_berths)*100:.1f}%")
+    log()
+
+    # Coach names (B1, B2 for AC_3_Tier coaches)
+    s_coaches, a_coaches = coach_names(config["sleeper_coaches"], config["ac_coaches"])
+    coaches_by_class = {"Sleeper": s_coaches, "AC_3_Tier": a_coaches}
+
+    log(f"🚇 COACH CONFIGURATION:")
+    log(f"  Sleeper Coaches: {', '.join(s_coaches)}")
+    log(f"  AC_3_Tier Coaches: {', '.join(a_coaches)}")
+    log()
+
+    # Identities are synthesised in bulk, FILL_CHUNK allocated rows at a time (attribute_synthesis.py)
+    identity_seed = f"{seed}:{config['train_number']}:{config['journey_date']}" if keyed else seed
+    synthesizer = AttributeSynthesizer(identity_seed, FIRST_NAMES, MIDDLE_NAMES, LAST_NAMES,
+                                       first_irctc=1 + config["id_offset"], first_pnr=1000000001 + config["id_offset"],
+                                       keyed=keyed)
+
+    allocator = CorrectAllocator()
+    berth_index = FreeBerthIndex(num_stations - 1, coaches_by_class, BERTH_MAPS)
+
+    # ----------------------------
+    # BUILD JOURNEY PAIRS
+    # ----------------------------
+    log("PHASE 1: Building journey pairs...")
+    metrics.phase("journeys")
+
+    boarding_pool = []
+    alighting_pool = []
+    for idx, (name, b_cnt, a_cnt) in enumerate(stations):
+        boarding_pool.extend([idx] * b_cnt)
+        alighting_pool.extend([idx] * a_cnt)
+
+    draws.shuffle("boarding", boarding_pool)
+    draws.shuffle("alighting", alighting_pool)
+
+    # Pair journeys with peak bias: boarding at stations 0-7, an alighting station from 9 on
+    # weighs 10, anything else 1. One weighted sampler per bias (Fenwick trees over the
+    # alighting stations); a station whose alighting quota is used up drops to weight 0 in both
+    pairs = []
+    alight_used = [0] * num_stations
+    alight_quota = [s[2] for s in stations]
+    open_station = [1 if quota > 0 else 0 for quota in alight_quota]
+    peak_sampler = FenwickSampler([w * (10 if idx >= 9 else 1) for idx, w in enumerate(open_station)])
+    flat_sampler = FenwickSampler(open_station)
+
+    for slot, board_idx in enumerate(boarding_pool):
+        sampler = peak_sampler if board_idx <= 7 else flat_sampler
+        alight_idx = sampler.sample(draws.slot("alight", slot), board_idx + 1)
+        if alight_idx is None:
+            alight_idx = min(board_idx + 1, num_stations - 1)
+    
+        pairs.append((board_idx, alight_idx))
+        alight_used[alight_idx] += 1
+        if alight_used[alight_idx] == alight_quota[alight_idx]:
+            peak_sampler.set(alight_idx, 0)
+            flat_sampler.set(alight_idx, 0)
+
+    log(f"✅ Created {len(pairs)} journeys\n")
+
+    # ----------------------------
+    # PHASE 2: CREATE RAC PAIRS (CORRECT LOGIC)
+    # ----------------------------
+    log("PHASE 2: Creating RAC pairs (2 passengers share 1 Side Lower berth)...")
+    metrics.phase("rac_selection")
+
+    # 5 Mandatory RAC journeys
+    mandatory_rac_journeys = [
+        (0, 16),   # Narasapur → Nandyal
+        (2, 20),   # Bhimavaram Jn → Bellary Jn
+        (2, 20),   # Bhimavaram Jn → Bellary Jn
+        (6, 27),   # Gudivada Jn → Hubballi Jn
+        (6, 27)    # Gudivada Jn → Hubballi Jn
+    ]
+
+    # Apply mandatory journeys to first 5 passengers
+    for i in range(5):
+        pairs[i] = mandatory_rac_journeys[i]
+
+    # Select RAC candidates based on journey length (prefer longer journeys)
+    journey_lengths = [(i, pairs[i][1] - pairs[i][0]) for i in range(len(pairs))]
+    journey_lengths.sort(key=lambda x: -x[1])  # Longest journeys first
+
+    rac_passenger_indices = set()
+
+    # Add mandatory passengers first
+    for i in range(5):
+        rac_passenger_indices.add(i)
+
+    # Add more candidates to reach RAC target (need even number)
+    remaining_needed = RAC_TARGET - len(rac_passenger_indices)
+    for idx, length in journey_lengths:
+        if len(rac_passenger_indices) >= RAC_TARGET:
+            break
+        if idx not in rac_passenger_indices:
+            rac_passenger_indices.add(idx)
+
+    # Ensure even number for pairing
+    if len(rac_passenger_indices) % 2 != 0:
+        rac_passenger_indices.remove(max(rac_passenger_indices))
+
+    log(f"✅ Selected {len(rac_passenger_indices)} passengers for RAC pairing\n")
+
+    # ----------------------------
+    # PHASE 3: CORRECT BERTH ALLOCATION
+    # ----------------------------
+    log("PHASE 3: Correct berth allocation...")
+
+    # Columnar passenger table - export dicts are only built when writing CSV/JSON/MongoDB
+    passengers = PassengerTable(config["train_number"], config["train_name"], config["journey_date"],
+                                [s[0] for s in stations], s_coaches + a_coaches + ["WL"])
+
+    # Streaming sinks (manifest_exporters) receive records as their identities are filled in,
+    # every FILL_CHUNK allocated rows
+    for sink in sinks:
+        passengers.add_sink(sink)
+
+    def allocate_rac_pairs():
+        """Allocate RAC passengers in pairs to side lower berths"""
+        # Pair only overlapping journeys (maximum matching on the interval graph), then
+        # pack the pairs onto Side Lower berths so pairs that never meet share one in turn
+        rac_list = sorted(rac_passenger_indices)
+        rac_pairs = [(rac_list[a], rac_list[b]) for a, b in match_overlapping([pairs[i] for i in rac_list])]
+        if len(rac_list) > 2 * len(rac_pairs):
+            metrics.fail("rac_no_partner", len(rac_list) - 2 * len(rac_pairs))
+        tracks, _ = pack_pairs([pair_span(pairs, p1, p2) for p1, p2 in rac_pairs])
+        side_lowers = side_lower_berths(coaches_by_class)
+    
+        successful_pairs = 0
+        rac_global_counter = 1
+        paired = set()
+        berths_used = set()
+    
+        for (passenger1, passenger2), track in zip(rac_pairs, tracks):
+            if track >= len(side_lowers):
+                metrics.fail("rac_capacity")  # more pairs on board at once than Side Lower berths
+                continue
+            coach_class, coach, berth = side_lowers[track]
+            board1, alight1 = pairs[passenger1]
+            board2, alight2 = pairs[passenger2]
+            if not allocator.add_rac_pair(coach, berth, board1, alight1, passenger1, board2, alight2, passenger2):
+                metrics.fail("overlap")
+                continue
+            berth_index.occupy(coach, berth, min(board1, board2), max(alight1, alight2))
+            berths_used.add((coach, berth))
+        
+            # Create passenger records for both
+            for passenger_idx, rac_num_offset in [(passenger1, 0), (passenger2, 1)]:
+                board, alight = pairs[passenger_idx]
+                passenger_status = "Online" if passenger_idx < 5 else "Offline"
+            
+                passengers.append(
+                    pnr_status="RAC",
+                    coach_class=coach_class,
+                    rac_status=str(rac_global_counter + rac_num_offset),
+                    board=board,
+                    alight=alight,
+                    coach=coach,
+                    berth=berth,
+                    berth_type="Side Lower",
+                    passenger_status=passenger_status,
+                    no_show=False
+                )
+                paired.add(passenger_idx)
+        
+            rac_global_counter += 2
+            successful_pairs += 1
+            synthesizer.fill(passengers, at_least=FILL_CHUNK)
+    
+        # Candidates without an overlapping partner (or a free Side Lower) are booked as CNF / WL
+        rac_passenger_indices.intersection_update(paired)
+    
+        return successful_pairs, len(berths_used)
+
+    def allocate_cnf_passengers():
+        """Allocate CNF passengers to available berths - NO overlaps allowed"""
+        cnf_indices = [i for i in range(len(pairs)) if i not in rac_passenger_indices]
+        allocated_cnf = 0
+        first_fit_cnf = None
+        berth_types = ["Lower", "Middle", "Upper", "Side Upper"]  # Side Lower stays reserved for RAC
+    
+        if config["cnf_mode"] == "interval":
+            # Preferences are drawn up front, then one boarding-order pass seats everyone
+            # (cnf_scheduler.py); first-fit is dry-run on the same passengers for the report
+            journeys = [pairs[idx] for idx in cnf_indices]
+            class_orders = [["Sleeper", "AC_3_Tier"] if draws.slot("class", idx).random() < 0.8 else ["AC_3_Tier", "Sleeper"]
+                            for idx in cnf_indices]
+            scheduled = dict(zip(cnf_indices, IntervalScheduler(berth_index, berth_types).schedule(journeys, class_orders)))
+            first_fit_slots = first_fit(copy.deepcopy(berth_index), journeys, class_orders, berth_types)
+            first_fit_cnf = sum(1 for slot in first_fit_slots if slot is not None)
+    
+        def first_fit_berths(prefer_sleeper, board, alight):
+            # Try the preferred class first, then the other one. Within a class the index
+            # returns the first berth (coach by coach, berth types in priority order) that
+            # is free over the whole journey
+            for coach_class in (["Sleeper", "AC_3_Tier"] if prefer_sleeper else ["AC_3_Tier", "Sleeper"]):
+                hit = berth_index.first_free_in_class(coach_class, berth_types, board, alight)
+                if hit is not None:
+                    yield (coach_class,) + hit
+    
+        for idx in cnf_indices:
+            board, alight = pairs[idx]
+            lookups = berth_index.lookups
+            if config["cnf_mode"] == "interval":
+                candidates = [scheduled[idx]] if scheduled[idx] else []
+            else:
+                candidates = first_fit_berths(draws.slot("class", idx).random() < 0.8, board, alight)
+        
+            allocated = False
+        
+            for coach_class, coach, berth, berth_type in candidates:
+                if allocator.add_cnf_passenger(coach, berth, board, alight, idx, berth_type):
+                    berth_index.occupy(coach, berth, board, alight)
+                
+                    passengers.append(
+                        pnr_status="CNF",
+                        coach_class=coach_class,
+                        rac_status="-",
+                        board=board,
+                        alight=alight,
+                        coach=coach,
+                        berth=berth,
+                        berth_type=berth_type,
+                        passenger_status="Offline",
+                        no_show=False
+                    )
+                    allocated_cnf += 1
+                    allocated = True
+                    break
+        
+            if config["cnf_mode"] != "interval":
+                metrics.probe("cnf", berth_index.lookups - lookups)
+            if not allocated:
+                metrics.fail("overlap")
+                # Create WL passenger
+                passengers.append(
+                    pnr_status="WL",
+                    coach_class="Sleeper",
+                    rac_status=str(draws.slot("wl", idx).randint(1, 50)),
+                    board=board,
+                    alight=alight,
+                    coach="WL",
+                    berth=0,
+                    berth_type="WL",
+                    passenger_status="Offline",
+                    no_show=False
+                )
+        
+            if len(passengers) % 200 == 0:
+                log(f"  Progress: {len(passengers)}/{total_target}")
+            synthesizer.fill(passengers, at_least=FILL_CHUNK)
+    
+        return allocated_cnf, first_fit_cnf
+
+    # Execute allocation
+    log("🔗 Allocating RAC pairs...")
+    metrics.phase("rac_allocation")
+    rac_pairs_allocated, side_lowers_used = allocate_rac_pairs()
+    log(f"✅ Allocated {rac_pairs_allocated} RAC pairs ({rac_pairs_allocated * 2} passengers) "
+        f"on {side_lowers_used} Side Lower berths")
+
+    log("🛌 Allocating CNF passengers...")
+    metrics.phase("cnf_allocation")
+    cnf_allocated, first_fit_cnf = allocate_cnf_passengers()
+    log(f"✅ Allocated {cnf_allocated} CNF passengers")
+    if first_fit_cnf is not None:
+        log(f"🧮 Interval scheduling: {cnf_allocated} CNF vs {first_fit_cnf} with first-fit "
+            f"({cnf_allocated - first_fit_cnf:+d} seated before anyone spills to WL)")
+
+    # Names, ages, genders, mobiles, PNRs and IRCTC IDs for the rows since the last chunk
+    metrics.phase("identities")
+    synthesizer.fill(passengers)
+    log(f"🧬 Synthesised identities for {synthesizer.filled} passengers")
+    metrics.stop()
+    metrics.rng_draws = synthesizer.draws()
+
+    total_allocated = len(passengers)
+    wl_count = total_allocated - (rac_pairs_allocated * 2) - cnf_allocated
+
+    log(f"\n📊 ALLOCATION SUMMARY:")
+    log(f"  Total Passengers: {total_allocated}/{total_target}")
+    log(f"  RAC Passengers: {rac_pairs_allocated * 2}")
+    log(f"  CNF Passengers: {cnf_allocated}")
+    log(f"  WL Passengers: {wl_count}")
+
+    stats = {
+        'target': total_target,
+        'journeys': len(pairs),
+        'rac_pairs': rac_pairs_allocated,
+        'side_lowers_used': side_lowers_used,
+        'rac': rac_pairs_allocated * 2,
+        'cnf': cnf_allocated,
+        'first_fit_cnf': first_fit_cnf,
+        'wl': wl_count,
+        'total_berths': total_berths
+    }
+    return Manifest(config, seed, stations, coaches_by_class, BERTH_MAPS, passengers, allocator, stats,
+                    metrics)
+
+
+def report(manifest, log=print):
+    """Verification and final report for a manifest from generate()"""
+    passengers = manifest.passengers
+    stations = manifest.stations
+
+    # ----------------------------
+    # VERIFICATION
+    # ----------------------------
+    log("🔍 Verifying allocation correctness...")
+
+    def verify_allocation():
+        """Verify both RAC and CNF allocations are correct (sweep line per berth, O(n log n))"""
+        report = manifest.verify()
+    
+        for collision in report['cnf_overlaps'][:5]:
+            p1 = passengers.record(collision['passenger1'])
+            p2 = passengers.record(collision['passenger2'])
+            log(f"❌ COLLISION: {p1['Name']}({p1['PNR_Status']}) & {p2['Name']}({p2['PNR_Status']}) in {collision['coach']}-{collision['berth']}")
+        for pair in report['rac_without_overlap'][:5]:
+            p1 = passengers.record(pair['passenger1'])
+            p2 = passengers.record(pair['passenger2'])
+            log(f"⚠️  RAC WITHOUT OVERLAP: {p1['Name']} & {p2['Name']} in {pair['coach']}-{pair['berth']}")
+    
+        collision_count = len(report['cnf_overlaps'])
+        return collision_count > 0, collision_count, report['valid_rac_pairs'], len(report['rac_without_overlap'])
+
+    collision_detected, collision_count, valid_rac_pairs, invalid_rac_pairs = verify_allocation()
+
+    log(f"✅ Generated {len(passengers)} passengers\n")
+
+    # ----------------------------
+    # ANALYSIS
+    # ----------------------------
+    log("PHASE 4: Final Analysis...")
+
+    rac_count = passengers.count("PNR_Status", "RAC")
+    cnf_count = passengers.count("PNR_Status", "CNF")
+    wl_count = passengers.count("PNR_Status", "WL")
+    online_count = passengers.count("Passenger_Status", "Online")
+    offline_count = passengers.count("Passenger_Status", "Offline")
+
+    # Count AC_3_Tier vs Sleeper passengers
+    sleeper_count = passengers.count("Class", "Sleeper")
+    ac_3_tier_count = passengers.count("Class", "AC_3_Tier")
+
+    # Peak calculation (berth x segment occupancy matrix, WL passengers hold no berth)
+    occupancy = manifest.occupancy()
+    station_index = occupancy.station_index
+    peak, peak_idx = occupancy.peak()
+
+    # RAC pair verification: partners hold consecutive RAC numbers (1 & 2, 3 & 4, ...) on one
+    # berth, and one Side Lower may carry several pairs one after another
+    rac_passengers = passengers.iter_records(passengers.rows("PNR_Status", "RAC"))
+    rac_pairs_found = defaultdict(list)
+    for p in rac_passengers:
+        key = (p["Assigned_Coach"], p["Assigned_berth"], (int(p["Rac_status"]) + 1) // 2)
+        rac_pairs_found[key].append(p)
+
+    pairs_count = sum(1 for k, v in rac_pairs_found.items() if len(v) == 2)
+    singles_count = sum(1 for k, v in rac_pairs_found.items() if len(v) == 1)
+    rac_berth_count = len(manifest.index().berths("RAC"))
+
+    log("\n" + "="*80)
+    log("🎉 FINAL REPORT - CORRECT ALLOCATION")
+    log("="*80)
+    log(f"Total Passengers: {len(passengers)}")
+    log(f"CNF Passengers: {cnf_count}")
+    log(f"RAC Passengers: {rac_count}")
+    log(f"WL Passengers: {wl_count}")
+    log(f"RAC Pairs (2 passengers sharing a berth): {pairs_count} on {rac_berth_count} Side Lower berths")
+    log(f"RAC Passengers without a partner (should be 0): {singles_count}")
+    log(f"Valid RAC Pairs (with overlap): {valid_rac_pairs}")
+    log(f"Collision-Free: {'✅ YES' if not collision_detected else '❌ NO'}")
+    log(f"Collisions Found: {collision_count}")
+    log(f"Peak Onboard: {peak} at {stations[peak_idx][0]}")
+    log(f"Capacity: {'✅ WITHIN' if peak <= MAX_ONBOARD_CAPACITY else '❌ EXCEEDS'} ({peak}/{MAX_ONBOARD_CAPACITY})")
+    log(f"Passenger Status - Online: {online_count}, Offline: {offline_count}")
+    log(f"Class Distribution - Sleeper: {sleeper_count}, AC_3_Tier: {ac_3_tier_count}")
+
+    # Show IRCTC_ID range
+    if len(passengers):
+        first_irctc = passengers[0]["IRCTC_ID"]
+        last_irctc = passengers[-1]["IRCTC_ID"]
+        log(f"IRCTC_ID Range: {first_irctc} to {last_irctc}")
+
+    # Show RAC pairs
+    log(f"\n📋 SAMPLE RAC PAIRS (first 5):")
+    shown = 0
+    for key, plist in rac_pairs_found.items():
+        if len(plist) == 2 and shown < 5:
+            p1, p2 = plist
+            board1 = station_index[p1["Boarding_Station"]]
+            alight1 = station_index[p1["Deboarding_Station"]]
+            board2 = station_index[p2["Boarding_Station"]]
+            alight2 = station_index[p2["Deboarding_Station"]]
+        
+            overlap_start = max(board1, board2)
+            overlap_end = min(alight1, alight2)
+            overlap_stations = overlap_end - overlap_start
+        
+            log(f"  Berth {key[0]}-{key[1]} (Side Lower):")
+            log(f"    {p1['IRCTC_ID']} - RAC {p1['Rac_status']}: {p1['Boarding_Station']} → {p1['Deboarding_Station']}")
+            log(f"    {p2['IRCTC_ID']} - RAC {p2['Rac_status']}: {p2['Boarding_Station']} → {p2['Deboarding_Station']}")
+            log(f"    Overlap: {overlap_stations} stations ({stations[overlap_start][0]} to {stations[overlap_end][0]})")
+            shown += 1
+
+    # Show Online passengers
+    log(f"\n✅ ONLINE PASSENGERS (Mandatory RAC):")
+    online_passengers = list(passengers.iter_records(passengers.rows("Passenger_Status", "Online")))
+    for i, p in enumerate(online_passengers[:10]):
+        status = f"RAC {p['Rac_status']}" if p['Rac_status'] != "-" else "CNF"
+        log(f"  {i+1}. {p['IRCTC_ID']} - {p['Name']} | {p['Boarding_Station']} → {p['Deboarding_Station']} | {status} | Class: {p['Class']}")
+
+    log("="*80)
@@ -0,0 +1,65 @@
+# passenger_generator/layout.py
+# RAKE LAYOUT AND NAME POOLS SHARED BY BOTH GENERATORS
+# Plain data only: importing this module does no work.
+
+# ----------------------------
+# BERTH MAPS
+# ----------------------------
+SLEEPER_BERTHS = {
+    "Lower": [1,4,9,12,17,20,25,28,33,36,41,44,49,52,57,60,65,68],
+    "Middle": [2,5,10,13,18,21,26,29,34,37,42,45,50,53,58,61,66,69],
+    "Upper": [3,6,11,14,19,22,27,30,35,38,43,46,51,54,59,62,67,70],
+    "Side Lower": [7,15,23,31,39,47,55,63,71],
+    "Side Upper": [8,16,24,32,40,48,56,64,72]
+}
+AC_BERTHS = {
+    "Lower": [1,4,9,12,17,20,25,28,33,36,41,44,49,52,57,60],
+    "Middle": [2,5,10,13,18,21,26,29,34,37,42,45,50,53,58,61],
+    "Upper": [3,6,11,14,19,22,27,30,35,38,43,46,51,54,59,62],
+    "Side Lower": [7,15,23,31,39,47,55,63],
+    "Side Upper": [8,16,24,32,40,48,56,64]
+}
+BERTH_MAPS = {"Sleeper": SLEEPER_BERTHS, "AC_3_Tier": AC_BERTHS}
+
+# ----------------------------
+# NAME POOLS
+# ----------------------------
+FIRST_MALE = ["Aarav","Aarush","Aayush","Aditya","Advik","Arjun","Arnav","Aryan","Atharv","Avi",
+    "Darsh","Dhruv","Ishaan","Kabir","Kian","Krish","Krishna","Laksh","Manan","Mivaan",
+    "Nirvaan","Pranav","Reyansh","Rudra","Sai","Shaurya","Shivansh","Tanay","Veer","Vihaan"]
+
+FIRST_FEMALE = ["Aadhya","Aanya","Aaradhya","Aditi","Ananya","Anika","Avni","Diya","Gauri","Ira",
+    "Jiya","Kavya","Kiara","Mahika","Navya","Pari","Riya","Saisha","Tanya","Zara"]
+
+MIDDLE_NAMES = ["Kumar","Singh","Raj","Dev","Prasad","Prakash","Chandra","Mohan","Babu","Reddy",
+    "Nath","Pal","Das","Lal","Rao","Naidu","Varma","Gupta","Verma","Patel"]
+
+LAST_NAMES = ["Sharma","Verma","Singh","Kumar","Patel","Reddy","Nair","Iyer","Rao","Das",
+    "Gupta","Joshi","Agarwal","Pandey","Mishra","Tiwari","Chauhan","Yadav","Jain","Shah",
+    "Mehta","Desai","Khan","Ali","Chopra","Kapoor","Bhatia","Malhotra","Khanna","Saxena"]
+
+FIRST_NAMES = FIRST_MALE + FIRST_FEMALE
+
+
+def coach_names(sleeper_coaches, ac_coaches):
+    """(["S1", ...], ["B1", ...]) for the requested rake"""
+    return ([f"S{i}" for i in range(1, sleeper_coaches + 1)],
+            [f"B{i}" for i in range(1, ac_coaches + 1)])
+
+
+def berth_capacity(sleeper_coaches, ac_coaches):
+    """(sleeper berths, AC_3_Tier berths) on the rake"""
+    return (sum(len(v) for v in SLEEPER_BERTHS.values()) * sleeper_coaches,
+            sum(len(v) for v in AC_BERTHS.values()) * ac_coaches)
+
+
+def side_lower_berths(coaches_by_class):
+    """[(class, coach, berth)] of every Side Lower in RAC preference order (Sleeper coaches first)"""
+    return [(coach_class, coach, berth)
+            for coach_class in ("Sleeper", "AC_3_Tier")
+            for coach in coaches_by_class[coach_class]
+            for berth in BERTH_MAPS[coach_class]["Side Lower"]]
+
+
+def quiet(*args, **kwargs):
+    """Default log: generate() prints nothing unless given log=print"""
@@ -0,0 +1,71 @@
+# passenger_generator/manifest.py
+# MANIFEST: THE RESULT OF ONE generate() CALL
+# The allocated PassengerTable together with the route and rake it was allocated
+# on, the allocator that did it and the generation counters, so callers can export,
+# verify or analyse it without re-deriving the layout.
+
+from binary_manifest import write_binary_manifest
+from manifest_index import ManifestIndex
+from manifest_verifier import verify_intervals
+from occupancy_matrix import OccupancyMatrix
+from online_allocator import OnlineAllocator
+
+
+class Manifest:
+    def __init__(self, config, seed, stations, coaches_by_class, berth_maps, passengers, allocator, stats,
+                 metrics=None):
+        self.config = config
+        self.seed = seed
+        self.stations = stations  # [(name, boarding count, alighting count)] in route order
+        self.coaches_by_class = coaches_by_class  # {"Sleeper": [...], "AC_3_Tier": [...]}
+        self.berth_maps = berth_maps  # {"Sleeper": {berth type: [berths]}, ...}
+        self.passengers = passengers  # PassengerTable
+        self.allocator = allocator
+        self.stats = stats  # generation counters (allocated, failed, berths, ...)
+        self.metrics = metrics  # GenerationMetrics (phase timings, probes, failures, RNG draws)
+        self._index = None
+
+    @property
+    def station_names(self):
+        return self.passengers.station_names
+
+    @property
+    def total_berths(self):
+        return sum(
+            len(coaches) * sum(len(berths) for berths in self.berth_maps[cls].values())
+            for cls, coaches in self.coaches_by_class.items()
+        )
+
+    def __len__(self):
+        return len(self.passengers)
+
+    def __iter__(self):
+        return self.passengers.iter_records()
+
+    def records(self):
+        """Export dicts one at a time (same documents as the CSV / JSON / MongoDB exports)"""
+        return self.passengers.iter_records()
+
+    def occupancy(self):
+        """Berth x segment OccupancyMatrix of the manifest"""
+        matrix = OccupancyMatrix(self.station_names, self.coaches_by_class, self.berth_maps)
+        matrix.add_table(self.passengers)
+        return matrix
+
+    def index(self):
+        """ManifestIndex over the passengers (PNR / IRCTC_ID, berth, station and segment queries), built once"""
+        if self._index is None or len(self._index) != len(self.passengers):
+            self._index = ManifestIndex.from_table(self.passengers)
+        return self._index
+
+    def verify(self):
+        """Sweep-line collision report (see manifest_verifier.verify_intervals), fed berth by berth from the index"""
+        return verify_intervals(self.index().intervals())
+
+    def write_binary(self, path):
+        """Fixed-width .rman file (binary_manifest.py) with the route and rake in its header"""
+        return write_binary_manifest(path, self.passengers, self.coaches_by_class, self.berth_maps)
+
+    def online(self):
+        """OnlineAllocator holding the manifest's CNF / RAC bookings, for cancel / no-show / upgrade"""
+        return OnlineAllocator.from_table(self.passengers, self.coaches_by_class, self.berth_maps)
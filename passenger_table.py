@@ -0,0 +1,269 @@
+# passenger_table.py
+# COMPACT COLUMNAR PASSENGER TABLE
+# Passengers are stored as parallel typed columns (array.array) instead of one
+# 20-key dict per record: stations, coaches and enums are small ints, numbers
+# (PNR, mobile, IRCTC sequence) are ints, and free text (names, emails) lives in a
+# UTF-8 heap with an offsets column. Dicts with the exported field names are only
+# built on demand (record / iter_records / to_records) at export time.
+# Allocation appends seats (append) and the identity columns are filled afterwards
+# in bulk (add_identities, see attribute_synthesis.py).
+
+from array import array
+
+import numpy as np
+
+# Export field order (matches the MongoDB / CSV / JSON documents)
+FIELDS = [
+    "IRCTC_ID", "PNR_Number", "Train_Number", "Train_Name", "Journey_Date",
+    "Name", "Age", "Gender", "Mobile", "Email", "PNR_Status", "Class", "Rac_status",
+    "Boarding_Station", "Deboarding_Station", "Assigned_Coach", "Assigned_berth",
+    "Berth_Type", "Passenger_Status", "NO_show"
+]
+
+# Enum columns: stored value is the index in the tuple
+PNR_STATUSES = ("CNF", "RAC", "WL")
+CLASSES = ("Sleeper", "AC_3_Tier")
+BERTH_TYPES = ("Lower", "Middle", "Upper", "Side Lower", "Side Upper", "WL")
+GENDERS = ("Male", "Female")
+PASSENGER_STATUSES = ("Offline", "Online")
+
+# Columns append() fills (besides the coach), in append() order
+ALLOCATION_COLUMNS = ("pnr_status", "coach_class", "rac_status", "board", "alight", "berth", "berth_type",
+                      "passenger_status", "no_show")
+
+
+class StringHeap:
+    """Append-only UTF-8 string column: one bytearray plus an end-offset per row"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.ends = array("q")
+
+    def append(self, value):
+        self.data += value.encode("utf-8")
+        self.ends.append(len(self.data))
+
+    def __getitem__(self, i):
+        start = self.ends[i - 1] if i > 0 else 0
+        return self.data[start:self.ends[i]].decode("utf-8")
+
+    def __len__(self):
+        return len(self.ends)
+
+
+class InternedColumn:
+    """Column of repeated strings (coach names): each distinct value is stored once"""
+
+    def __init__(self, values=()):
+        self.values = []
+        self.codes = {}
+        self.rows = array("H")
+        for value in values:
+            self.code(value)
+
+    def code(self, value):
+        if value not in self.codes:
+            self.codes[value] = len(self.values)
+            self.values.append(value)
+        return self.codes[value]
+
+    def append(self, value):
+        self.rows.append(self.code(value))
+
+    def __getitem__(self, i):
+        return self.values[self.rows[i]]
+
+    def __len__(self):
+        return len(self.rows)
+
+
+class PassengerTable:
+    def __init__(self, train_number, train_name, journey_date, station_names, coaches=()):
+        self.train_number = train_number
+        self.train_name = train_name
+        self.journey_date = journey_date
+        self.station_names = list(station_names)
+        self.station_index = {name: i for i, name in enumerate(self.station_names)}
+
+        self.irctc_seq = array("i")
+        self.pnr = array("q")
+        self.names = StringHeap()
+        self.age = array("B")
+        self.gender = array("B")
+        self.mobile = array("q")
+        self.emails = StringHeap()
+        self.pnr_status = array("B")
+        self.coach_class = array("B")
+        self.rac_status = array("h")  # 0 means "-"
+        self.board = array("H")  # route indexes: routes can exceed 256 stations
+        self.alight = array("H")
+        self.coach = InternedColumn(coaches)
+        self.berth = array("h")
+        self.berth_type = array("B")
+        self.passenger_status = array("B")
+        self.no_show = array("B")
+        self.sinks = []  # streaming exporters that receive each record once it is complete
+
+        # Export field -> (column, values) for the enum-like fields that can be scanned
+        self._enum_fields = {
+            "PNR_Status": (self.pnr_status, PNR_STATUSES),
+            "Class": (self.coach_class, CLASSES),
+            "Berth_Type": (self.berth_type, BERTH_TYPES),
+            "Gender": (self.gender, GENDERS),
+            "Passenger_Status": (self.passenger_status, PASSENGER_STATUSES),
+        }
+
+    def append(self, pnr_status, coach_class, rac_status, board, alight, coach, berth, berth_type,
+               passenger_status, no_show=False):
+        """Append one allocated seat; returns its row number (identity columns come later)"""
+        self.pnr_status.append(PNR_STATUSES.index(pnr_status))
+        self.coach_class.append(CLASSES.index(coach_class))
+        self.rac_status.append(0 if rac_status == "-" else int(rac_status))
+        self.board.append(board)
+        self.alight.append(alight)
+        self.coach.append(coach)
+        self.berth.append(berth)
+        self.berth_type.append(BERTH_TYPES.index(berth_type))
+        self.passenger_status.append(PASSENGER_STATUSES.index(passenger_status))
+        self.no_show.append(1 if no_show else 0)
+        return len(self.pnr_status) - 1
+
+    def allocation_columns(self, start=0, end=None):
+        """NumPy copies of the allocation columns of rows [start, end) (coaches by name), e.g. to cache them"""
+        end = len(self) if end is None else end
+        columns = {name: np.array(getattr(self, name)[start:end]) for name in ALLOCATION_COLUMNS}
+        columns["coach"] = np.array([self.coach[i] for i in range(start, end)], dtype=str)
+        return columns
+
+    def extend_allocations(self, columns):
+        """Append the rows of an allocation_columns() dict (identity columns come later, as for append)"""
+        for name in ALLOCATION_COLUMNS:
+            getattr(self, name).extend(np.asarray(columns[name]).tolist())
+        for coach in np.asarray(columns["coach"]).tolist():
+            self.coach.append(coach)
+
+    def add_identities(self, irctc_seq, pnr, names, ages, genders, mobiles, emails):
+        """
+        Append the identity columns for the next rows that do not have them yet
+        (NumPy arrays or sequences; genders as GENDERS codes). Those rows are then
+        complete and are streamed to the sinks.
+        """
+        start = len(self.irctc_seq)
+        if start + len(pnr) > len(self):
+            raise ValueError("more identities than allocated rows")
+        self.irctc_seq.frombytes(np.asarray(irctc_seq, dtype=np.intc).tobytes())
+        self.pnr.frombytes(np.asarray(pnr, dtype=np.longlong).tobytes())
+        self.age.frombytes(np.asarray(ages, dtype=np.uint8).tobytes())
+        self.gender.frombytes(np.asarray(genders, dtype=np.uint8).tobytes())
+        self.mobile.frombytes(np.asarray(mobiles, dtype=np.longlong).tobytes())
+        for name, email in zip(names, emails):
+            self.names.append(name)
+            self.emails.append(email)
+        if self.sinks:
+            for row in range(start, len(self.irctc_seq)):
+                record = self.record(row)
+                for sink in self.sinks:
+                    sink.write(record)
+
+    def pending_identities(self):
+        """Number of allocated rows still waiting for add_identities()"""
+        return len(self) - len(self.irctc_seq)
+
+    def add_sink(self, sink):
+        """Stream every future completed record to sink.write(record)"""
+        self.sinks.append(sink)
+
+    def __len__(self):
+        return len(self.pnr_status)
+
+    # ----------------------------
+    # COLUMN SCANS
+    # ----------------------------
+    def column(self, field):
+        """NumPy copy of an int column by export field name (enums as codes)"""
+        if field in self._enum_fields:
+            return np.array(self._enum_fields[field][0])
+        if field == "Boarding_Station":
+            return np.array(self.board)
+        if field == "Deboarding_Station":
+            return np.array(self.alight)
+        if field == "Assigned_Coach":
+            return np.array(self.coach.rows)
+        if field == "Assigned_berth":
+            return np.array(self.berth)
+        if field == "Age":
+            return np.array(self.age)
+        raise KeyError(f"{field} is not an integer column")
+
+    def mask(self, field, value):
+        """Boolean row mask for field == value"""
+        if field in self._enum_fields:
+            code = self._enum_fields[field][1].index(value)
+        elif field in ("Boarding_Station", "Deboarding_Station"):
+            code = self.station_index[value]
+        elif field == "Assigned_Coach":
+            code = self.coach.codes.get(value, -1)
+        else:
+            code = value
+        return self.column(field) == code
+
+    def rows(self, field, value):
+        """Row numbers where field == value, in insertion order"""
+        return np.flatnonzero(self.mask(field, value))
+
+    def count(self, field, value):
+        """Number of passengers with field == value"""
+        return int(np.count_nonzero(self.mask(field, value)))
+
+    def count_where(self, conditions):
+        """Number of passengers matching every {field: value} condition"""
+        matched = np.ones(len(self), dtype=bool)
+        for field, value in conditions.items():
+            matched &= self.mask(field, value)
+        return int(np.count_nonzero(matched))
+
+    # ----------------------------
+    # MATERIALISATION (export only)
+    # ----------------------------
+    def record(self, i):
+        """Build the export dict for row i (negative indexes count from the end)"""
+        if i < 0:
+            i += len(self)
+        rac_status = self.rac_status[i]
+        return {
+            "IRCTC_ID": f"IR_{self.irctc_seq[i]:04d}",
+            "PNR_Number": str(self.pnr[i]),
+            "Train_Number": self.train_number,
+            "Train_Name": self.train_name,
+            "Journey_Date": self.journey_date,
+            "Name": self.names[i],
+            "Age": self.age[i],
+            "Gender": GENDERS[self.gender[i]],
+            "Mobile": str(self.mobile[i]),
+            "Email": self.emails[i],
+            "PNR_Status": PNR_STATUSES[self.pnr_status[i]],
+            "Class": CLASSES[self.coach_class[i]],
+            "Rac_status": str(rac_status) if rac_status else "-",
+            "Boarding_Station": self.station_names[self.board[i]],
+            "Deboarding_Station": self.station_names[self.alight[i]],
+            "Assigned_Coach": self.coach[i],
+            "Assigned_berth": self.berth[i],
+            "Berth_Type": BERTH_TYPES[self.berth_type[i]],
+            "Passenger_Status": PASSENGER_STATUSES[self.passenger_status[i]],
+            "NO_show": bool(self.no_show[i])
+        }
+
+    def __getitem__(self, i):
+        return self.record(i)
+
+    def iter_records(self, rows=None):
+        """Yield export dicts one at a time (all rows, or the given row numbers)"""
+        for i in (range(len(self)) if rows is None else rows):
+            yield self.record(int(i))
+
+    def __iter__(self):
+        return self.iter_records()
+
+    def to_records(self):
+        """List of export dicts (for json.dump / insert_many)"""
+        return list(self.iter_records())
@@ -0,0 +1,136 @@
+# phase_cache.py
+# CONTENT-ADDRESSED CACHE OF ALLOCATION PHASES
+# A generator phase (constraint passengers, fill to 100% occupancy, ...) is a pure
+# function of its inputs: the station table, berth maps, coach counts, constraints,
+# seed and the output of the phases before it. Each phase's result is stored as one
+# .npz file named after a SHA-256 of exactly those inputs, so a run with unchanged
+# inputs loads it instead of allocating again, and changing a downstream knob
+# (journey_mix, passenger_scale, cnf_mode) only recomputes the phases that read it.
+# Keys chain: a phase key includes the key of the phase it continues from, and the first
+# key includes source_digest() of the allocator modules, so editing the allocator code
+# invalidates every stored phase without anyone having to remember to.
+# Besides its rows a phase stores what it reported (PhaseRecorder: log lines, failure and
+# probe metrics); replay() repeats that on a hit, so a hit and a miss report the same run.
+#
+#   cache = PhaseCache(".allocation_cache")
+#   key = cache_key("constraints", stations, BERTH_MAPS, coaches, seed)
+#   arrays = cache.load("constraints", key)
+#   if arrays is None:
+#       ...allocate...
+#       cache.store("constraints", key, board=..., alight=...)
+#
+# Bump CACHE_VERSION when the layout of the stored arrays changes.
+
+import hashlib
+import json
+import os
+import sys
+import zipfile
+from collections import Counter
+
+import numpy as np
+
+CACHE_VERSION = 2
+
+
+def cache_key(*parts):
+    """Hex SHA-256 of the JSON form of parts (tuples and lists hash alike, dict keys sorted)"""
+    text = json.dumps([CACHE_VERSION, *parts], sort_keys=True, separators=(",", ":"), default=list)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def source_digest(module_names):
+    """Hex SHA-256 of the source files of the named (already imported) modules"""
+    digest = hashlib.sha256()
+    for name in sorted(module_names):
+        with open(sys.modules[name].__file__, "rb") as f:
+            digest.update(name.encode("utf-8") + b"\0" + f.read())
+    return digest.hexdigest()
+
+
+def rng_state(rng):
+    """random.Random state as a uint32 array (so a cached phase hands the next one the same stream)"""
+    version, internal, gauss_next = rng.getstate()
+    if gauss_next is not None:
+        raise ValueError("random.Random state with a pending gauss() value cannot be cached")
+    return np.array(internal, dtype=np.uint32)
+
+
+def set_rng_state(rng, state):
+    rng.setstate((3, tuple(int(x) for x in state), None))
+
+
+class PhaseRecorder:
+    """
+    Stands in for log() while a phase runs: passes every line on and keeps it, and
+    arrays() returns those lines plus the failures / probes recorded in metrics since
+    the recorder was created, ready for PhaseCache.store().
+    """
+
+    def __init__(self, log, metrics):
+        self.log = log
+        self.metrics = metrics
+        self.lines = []
+        self.failures = Counter(metrics.failures)
+        self.probes = {kind: Counter(histogram) for kind, histogram in metrics.probes.items()}
+
+    def __call__(self, *args):
+        self.lines.append(" ".join(str(arg) for arg in args))
+        self.log(*args)
+
+    def arrays(self):
+        probes = {}
+        for kind, histogram in self.metrics.probes.items():
+            added = histogram - self.probes.get(kind, Counter())
+            if added:
+                probes[kind] = {str(p): n for p, n in added.items()}
+        reported = {"failures": dict(self.metrics.failures - self.failures), "probes": probes}
+        return {"log": np.array(self.lines, dtype=str), "reported": np.array(json.dumps(reported))}
+
+
+def replay(arrays, log, metrics):
+    """Repeat what a stored phase reported: its log lines, failures and probes"""
+    for line in arrays["log"].tolist():
+        log(line)
+    reported = json.loads(str(arrays["reported"]))
+    for reason, n in reported["failures"].items():
+        metrics.fail(reason, n)
+    for kind, histogram in reported["probes"].items():
+        for probes, n in histogram.items():
+            metrics.probe(kind, int(probes), n)
+
+
+class PhaseCache:
+    def __init__(self, directory):
+        self.directory = directory
+        self.hits = []  # phase names loaded from disk
+        self.misses = []  # phase names computed (and stored)
+
+    def path(self, phase, key):
+        return os.path.join(self.directory, f"{phase}-{key[:24]}.npz")
+
+    def load(self, phase, key):
+        """The arrays stored for (phase, key) as a dict, or None if there are none yet"""
+        path = self.path(phase, key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+        except FileNotFoundError:
+            arrays = None
+        except (OSError, ValueError, zipfile.BadZipFile):
+            arrays = None  # partial or foreign file: recompute and overwrite it
+        if arrays is None or str(arrays.pop("_key", "")) != key:
+            self.misses.append(phase)
+            return None
+        self.hits.append(phase)
+        return arrays
+
+    def store(self, phase, key, **arrays):
+        """Write the phase result atomically (a reader never sees a half-written file)"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(phase, key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, _key=np.array(key), **arrays)
+        os.replace(tmp, path)
+        return path
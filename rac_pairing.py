@@ -0,0 +1,80 @@
+# rac_pairing.py
+# RAC PAIR MATCHING AND SIDE LOWER PACKING ON THE INTERVAL GRAPH
+# Two RAC passengers can only share a Side Lower berth when their journeys overlap,
+# i.e. when they are adjacent in the interval graph of the candidates' journeys.
+#
+# match_overlapping(): maximum matching of that graph in O(n log n). Journeys are
+# visited by alighting station; an unmatched journey is paired with the unmatched,
+# not yet visited journey that boarded before it alights and alights first (the
+# classic greedy for interval graphs, which never loses a pair).
+#
+# pack_pairs(): interval partitioning of the matched pairs. A pair holds its berth
+# from the first boarding to the last alighting of the two; pairs are taken by
+# boarding station and go to the berth released earliest (min-heap of release
+# stations) when it is already free, otherwise to the next unused berth, so pairs
+# that do not overlap reuse one Side Lower in sequence and the number of berths
+# used is the minimum possible (the largest number of pairs on board at once).
+#
+#   journeys = [(0, 8), (2, 10), (18, 27), (12, 24)]
+#   pairs = match_overlapping(journeys)  # [(0, 1), (3, 2)]
+#   tracks, used = pack_pairs([pair_span(journeys, a, b) for a, b in pairs])  # [0, 0], 1
+
+import heapq
+
+
+def match_overlapping(journeys):
+    """
+    Maximum set of disjoint (i, j) pairs of overlapping journeys.
+    journeys: [(board, alight)] with board < alight; pairs are returned in the order
+    they were formed (by the earlier alighting of the two).
+    """
+    order = sorted(range(len(journeys)), key=lambda i: (journeys[i][1], journeys[i][0], i))
+    by_board = sorted(range(len(journeys)), key=lambda i: (journeys[i][0], i))
+    done = [False] * len(journeys)  # visited by the sweep, or matched
+    waiting = []  # heap of (alight, i) for journeys that boarded before the current one alights
+    next_board = 0
+    pairs = []
+
+    for i in order:
+        if done[i]:
+            continue
+        done[i] = True
+        alight = journeys[i][1]
+        while next_board < len(by_board) and journeys[by_board[next_board]][0] < alight:
+            j = by_board[next_board]
+            heapq.heappush(waiting, (journeys[j][1], j))
+            next_board += 1
+        # Every journey left in the heap alights no earlier than i and boarded before i
+        # alights, so the first one not yet done overlaps i
+        while waiting and done[waiting[0][1]]:
+            heapq.heappop(waiting)
+        if waiting:
+            _, j = heapq.heappop(waiting)
+            done[j] = True
+            pairs.append((i, j))
+    return pairs
+
+
+def pair_span(journeys, a, b):
+    """Stations over which a matched pair holds its berth"""
+    return min(journeys[a][0], journeys[b][0]), max(journeys[a][1], journeys[b][1])
+
+
+def pack_pairs(spans):
+    """
+    Berth (track) number for every pair span [(start, end)]; returns (tracks, berths used).
+    Track 0 is the first berth in the caller's preference order, track 1 the second, ...
+    """
+    tracks = [None] * len(spans)
+    released = []  # heap of (release station, track)
+    used = 0
+    for k in sorted(range(len(spans)), key=lambda k: (spans[k][0], spans[k][1], k)):
+        start, end = spans[k]
+        if released and released[0][0] <= start:
+            _, track = heapq.heappop(released)
+        else:
+            track = used
+            used += 1
+        tracks[k] = track
+        heapq.heappush(released, (end, track))
+    return tracks, used
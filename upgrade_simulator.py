@@ -0,0 +1,234 @@
+# upgrade_simulator.py
+# MONTE-CARLO RAC UPGRADE SIMULATOR
+# Replays the journey of a generated manifest station by station many times over,
+# injecting cancellations and no-shows, and upgrades RAC passengers into the berths
+# they free with the same rules as the backend's ReallocationService.processVacancyForUpgrade
+# and EligibilityService stage 1:
+#   - the RAC passenger has boarded, is Online and has not denied this berth before
+#     (--include-offline: Offline RAC passengers are eligible too, as when the TTE
+#     offers the berth in person; the generated manifests have few Online RAC passengers)
+#   - same class, and the vacancy covers the rest of their journey (vacantFromIdx <=
+#     current station, vacantToIdx >= their deboarding station)
+#   - offers go out in RAC number order (Rule 9); each passenger accepts with
+#     --accept-rate, the first to accept takes the berth, a refusal is remembered
+# Seats are kept in an OnlineAllocator, so every cancel / no-show / upgrade is an
+# incremental update. Trials run on a process pool; every worker generates the
+# manifest once and each trial draws from its own seed, so results do not depend on
+# the number of workers.
+#
+# Reports, per scenario (no-show rate x cancellation rate): upgrades per trial next to the
+# eligible pool (RAC passengers who boarded and may be offered a berth), share of RAC
+# passengers upgraded, idle berth-segments, vacancy-to-upgrade latency in stations
+# and the wall time of one station step (p50 / p95 / p99).
+#
+# Usage:
+#   python upgrade_simulator.py --trials 2000 --no-show-rate 0.02 0.05 0.1 --cancel-rate 0 0.03
+#   python upgrade_simulator.py --algorithm optimized --workers 8 --output upgrades.json
+#   python upgrade_simulator.py --include-offline --no-show-rate 0.05 0.1 0.2
+
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+from online_allocator import OnlineAllocator
+from passenger_table import CLASSES, PASSENGER_STATUSES, PNR_STATUSES
+
+# Per-worker manifest and the per-passenger columns the simulation reads
+_STATE = {}
+
+
+def _load(config, seed):
+    from passenger_generator import generate
+
+    manifest = generate(config, seed)
+    table = manifest.passengers
+    wl_code = PNR_STATUSES.index("WL")
+    passengers = []  # (pid, board, alight, is_rac, rac_number, class, online)
+    for row in range(len(table)):
+        if table.pnr_status[row] == wl_code:
+            continue
+        passengers.append((
+            str(table.pnr[row]),
+            table.board[row],
+            table.alight[row],
+            PNR_STATUSES[table.pnr_status[row]] == "RAC",
+            table.rac_status[row],
+            CLASSES[table.coach_class[row]],
+            PASSENGER_STATUSES[table.passenger_status[row]] == "Online"
+        ))
+    _STATE["manifest"] = manifest
+    _STATE["passengers"] = passengers
+
+
+def _percentiles(values, qs=(50, 95, 99)):
+    if not len(values):
+        return {f"p{q}": None for q in qs}
+    return {f"p{q}": float(v) for q, v in zip(qs, np.percentile(values, qs))}
+
+
+def simulate(trial_seed, no_show_rate, cancel_rate, accept_rate, include_offline=False):
+    """One journey; returns the trial's counters"""
+    manifest = _STATE["manifest"]
+    passengers = _STATE["passengers"]
+    rng = random.Random(trial_seed)
+    engine = OnlineAllocator.from_table(manifest.passengers, manifest.coaches_by_class, manifest.berth_maps)
+    num_stations = engine.num_segments + 1
+
+    # Fate of every passenger: cancelled at some station before boarding, no-show at
+    # their boarding station, or travelling; travelling RAC passengers who can be offered
+    # a berth (Online, or any with include_offline) form the eligible pool
+    cancel_at = [[] for _ in range(num_stations)]
+    no_show_at = [[] for _ in range(num_stations)]
+    rac_boarding = [[] for _ in range(num_stations)]
+    eligible = 0
+    for pid, board, alight, is_rac, rac_number, coach_class, online in passengers:
+        draw = rng.random()
+        if draw < cancel_rate:
+            cancel_at[rng.randint(0, board)].append(pid)
+        elif draw < cancel_rate + no_show_rate:
+            no_show_at[board].append(pid)
+        elif is_rac and (online or include_offline):
+            rac_boarding[board].append((rac_number, pid, alight, coach_class))
+            eligible += 1
+
+    on_board_rac = []  # sorted by RAC number
+    denied = set()  # (pid, berth) offers refused
+    upgrades = offers = 0
+    latencies = []
+    step_seconds = []
+    idle = 0
+
+    for station in range(num_stations - 1):
+        started = time.perf_counter()
+        for pid in cancel_at[station]:
+            engine.cancel(pid)
+        for pid in no_show_at[station]:
+            engine.mark_no_show(pid, station)
+        on_board_rac = sorted(
+            [rac for rac in on_board_rac if rac[2] > station] + rac_boarding[station])
+
+        for vacancy in engine.vacant_ranges(station):
+            berth = (vacancy["coach"], vacancy["berth"])
+            for rac in on_board_rac:
+                rac_number, pid, alight, coach_class = rac
+                if (pid, berth) in denied:
+                    continue
+                if coach_class != vacancy["class"] or vacancy["vacant_to"] < alight:
+                    continue
+                offers += 1
+                if rng.random() >= accept_rate:
+                    denied.add((pid, berth))
+                    continue
+                engine.upgrade_rac(pid, berth, station)
+                on_board_rac.remove(rac)
+                upgrades += 1
+                latencies.append(station - vacancy["vacant_from"])
+                break
+            else:
+                idle += 1  # nobody took it: the berth stays empty over this segment
+        step_seconds.append(time.perf_counter() - started)
+
+    return {
+        "upgrades": upgrades,
+        "eligible": eligible,
+        "offers": offers,
+        "idle_berth_segments": idle,
+        "latencies": latencies,
+        "step_seconds": step_seconds
+    }
+
+
+def _run_batch(args):
+    seeds, no_show_rate, cancel_rate, accept_rate, include_offline = args
+    return [simulate(seed, no_show_rate, cancel_rate, accept_rate, include_offline) for seed in seeds]
+
+
+def run_scenario(pool, seed, trials, no_show_rate, cancel_rate, accept_rate, include_offline=False, batch_size=25):
+    """Spread trials over the pool; returns the aggregated report dict"""
+    seeds = [f"{seed}:{no_show_rate}:{cancel_rate}:{trial}" for trial in range(trials)]
+    batches = [(seeds[i:i + batch_size], no_show_rate, cancel_rate, accept_rate, include_offline)
+               for i in range(0, trials, batch_size)]
+    runs = list(itertools.chain.from_iterable(pool.map(_run_batch, batches)))
+
+    rac_total = sum(1 for p in _STATE["passengers"] if p[3]) if _STATE else None
+    upgrades = np.array([run["upgrades"] for run in runs])
+    eligible = np.array([run["eligible"] for run in runs])
+    latencies = np.array(list(itertools.chain.from_iterable(run["latencies"] for run in runs)))
+    steps = np.array(list(itertools.chain.from_iterable(run["step_seconds"] for run in runs))) * 1000
+    return {
+        "no_show_rate": no_show_rate,
+        "cancel_rate": cancel_rate,
+        "accept_rate": accept_rate,
+        "include_offline": include_offline,
+        "trials": trials,
+        "upgrades_mean": float(upgrades.mean()),
+        "upgrades": _percentiles(upgrades, (5, 50, 95)),
+        "eligible_mean": float(eligible.mean()),
+        "upgraded_share": float(upgrades.mean() / rac_total) if rac_total else None,
+        "upgraded_share_of_eligible": float(upgrades.mean() / eligible.mean()) if eligible.any() else None,
+        "offers_mean": float(np.mean([run["offers"] for run in runs])),
+        "idle_berth_segments_mean": float(np.mean([run["idle_berth_segments"] for run in runs])),
+        "latency_stations": _percentiles(latencies),
+        "step_ms": _percentiles(steps)
+    }
+
+
+def main(argv=None):
+    from passenger_generator import DEFAULT_SEED
+
+    parser = argparse.ArgumentParser(description="Monte-Carlo RAC upgrade simulation over a generated manifest")
+    parser.add_argument("--algorithm", default="correct")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="manifest seed (trial seeds derive from it)")
+    parser.add_argument("--trials", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--no-show-rate", type=float, nargs="+", default=[0.05])
+    parser.add_argument("--cancel-rate", type=float, nargs="+", default=[0.02])
+    parser.add_argument("--accept-rate", type=float, default=0.8, help="chance an offered RAC passenger accepts")
+    parser.add_argument("--include-offline", action="store_true",
+                        help="Offline RAC passengers are offered upgrades too (by the TTE), not only Online ones")
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    config = {"algorithm": args.algorithm}
+    _load(config, args.seed)
+    rac_total = sum(1 for p in _STATE["passengers"] if p[3])
+    rac_online = sum(1 for p in _STATE["passengers"] if p[3] and p[6])
+    print(f"🚆 {len(_STATE['passengers'])} seated passengers, {rac_total} RAC ({rac_online} Online); "
+          f"{args.trials} trials per scenario on {args.workers} workers")
+    print(f"   Eligible for upgrades: {'all RAC (--include-offline)' if args.include_offline else 'Online RAC only'}")
+    if not args.include_offline and rac_online < rac_total:
+        print(f"   ⚠️  Only {rac_online} of {rac_total} RAC passengers are Online, so upgrade counts barely move "
+              f"with the no-show rate; --include-offline simulates the whole RAC list")
+
+    results = []
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=get_context("spawn"),
+                             initializer=_load, initargs=(config, args.seed)) as pool:
+        for no_show_rate, cancel_rate in itertools.product(args.no_show_rate, args.cancel_rate):
+            result = run_scenario(pool, args.seed, args.trials, no_show_rate, cancel_rate, args.accept_rate,
+                                  args.include_offline)
+            results.append(result)
+            share = result['upgraded_share']
+            print(f"   no-show {no_show_rate:.0%} cancel {cancel_rate:.0%}: "
+                  f"{result['upgrades_mean']:.1f} upgrades of {result['eligible_mean']:.1f} eligible "
+                  f"({'no RAC' if share is None else f'{share:.1%} of RAC'}), "
+                  f"idle {result['idle_berth_segments_mean']:.0f} berth-segments, "
+                  f"latency p50/p95/p99 {result['latency_stations']['p50']}/"
+                  f"{result['latency_stations']['p95']}/{result['latency_stations']['p99']} stations, "
+                  f"step p99 {result['step_ms']['p99']:.2f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"algorithm": args.algorithm, "seed": args.seed, "include_offline": args.include_offline,
+                       "results": results}, f, indent=2)
+        print(f"✅ Results: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
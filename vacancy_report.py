@@ -0,0 +1,153 @@
+# vacancy_report.py
+# PER-STATION VACANT BERTH SEGMENTS, COMPUTED ONCE AT GENERATION TIME
+# The backend rediscovers vacant berth segments on every station change
+# (TrainState.getVacantBerths / _findAllVacantRanges walk every berth and passenger).
+# The generator already has the berth x segment OccupancyMatrix, so every berth's
+# vacant ranges are found in one vectorised pass and indexed by station: station s
+# lists the ranges with vacantFromIdx <= s < vacantToIdx (the backend's
+# isCurrentlyVacant), each with the full range so the backend can warm-start its view.
+#
+# Two export shapes:
+#   station_documents()  one MongoDB document per station (same vacancy field names as
+#                        VacancyService), loaded next to the passengers collection
+#   write_blob()         a compressed .npz with the range arrays and a CSR station index
+#
+#   python vacancy_report.py                      # default manifest -> vacancies.npz
+#   python vacancy_report.py --mongo --collection P_1_vacancies
+
+import argparse
+
+import numpy as np
+from pymongo import ASCENDING, IndexModel, MongoClient
+
+from mongo_loader import DEFAULT_URI, load_passengers
+
+# One document per station; the backend looks them up by station index
+VACANCY_INDEXES = [
+    IndexModel([("stationIdx", ASCENDING)], name="idx_station_idx", unique=True),
+]
+
+
+class VacancyReport:
+    def __init__(self, matrix):
+        """matrix: OccupancyMatrix of the allocated manifest"""
+        self.matrix = matrix
+        self.rows, self.starts, self.ends = matrix.vacant_ranges()
+
+        # CSR index station -> ranges: range k is listed under stations starts[k] .. ends[k] - 1
+        lengths = self.ends - self.starts
+        range_ids = np.repeat(np.arange(lengths.size), lengths)
+        first = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        stations = np.repeat(self.starts, lengths) + np.arange(range_ids.size) - first
+        order = np.argsort(stations, kind="stable")
+        self.station_ranges = range_ids[order]
+        self.station_offsets = np.zeros(matrix.num_stations + 1, dtype=np.int64)
+        np.cumsum(np.bincount(stations, minlength=matrix.num_stations), out=self.station_offsets[1:])
+
+    def __len__(self):
+        return int(self.rows.size)
+
+    def ranges_at(self, station):
+        """Indexes (into rows / starts / ends) of the ranges vacant at station, in berth order"""
+        return self.station_ranges[self.station_offsets[station]:self.station_offsets[station + 1]]
+
+    def counts(self):
+        """Vacant berths per station"""
+        return np.diff(self.station_offsets)
+
+    def vacancy(self, k):
+        """One range in the backend's vacancy shape"""
+        matrix = self.matrix
+        row = self.rows[k]
+        coach = matrix.coaches[matrix.row_coach[row]]
+        berth = int(matrix.row_berth[row])
+        start, end = int(self.starts[k]), int(self.ends[k])
+        return {
+            'coachNo': coach,
+            'berthNo': berth,
+            'fullBerthNo': f"{coach}-{berth}",
+            'type': matrix.berth_types[matrix.row_type[row]],
+            'class': matrix.classes[matrix.row_class[row]],
+            'vacantFromIdx': start,
+            'vacantToIdx': end,
+            'vacantFromStation': matrix.station_names[start],
+            'vacantToStation': matrix.station_names[end]
+        }
+
+    def station_documents(self, train_number=None, journey_date=None):
+        """One document per station with every berth vacant on the segment leaving it"""
+        for station, name in enumerate(self.matrix.station_names):
+            vacancies = [self.vacancy(k) for k in self.ranges_at(station).tolist()]
+            yield {
+                'trainNo': train_number,
+                'journeyDate': journey_date,
+                'stationIdx': station,
+                'stationName': name,
+                'vacantCount': len(vacancies),
+                'vacancies': vacancies
+            }
+
+    def write_blob(self, path):
+        """Compressed .npz: berth tables, range arrays and the CSR station index"""
+        matrix = self.matrix
+        np.savez_compressed(
+            path,
+            station_names=np.array(matrix.station_names),
+            coaches=np.array(matrix.coaches),
+            classes=np.array(matrix.classes),
+            berth_types=np.array(matrix.berth_types),
+            row_coach=matrix.row_coach,
+            row_class=matrix.row_class,
+            row_berth=matrix.row_berth,
+            row_type=matrix.row_type,
+            rows=self.rows.astype(np.int32),
+            starts=self.starts.astype(np.int16),
+            ends=self.ends.astype(np.int16),
+            station_ranges=self.station_ranges.astype(np.int32),
+            station_offsets=self.station_offsets
+        )
+
+
+def load_blob(path):
+    """{array name: array} from a write_blob() file"""
+    with np.load(path) as blob:
+        return {name: blob[name] for name in blob.files}
+
+
+def export_to_mongo(client, db_name, collection_name, report, train_number=None, journey_date=None):
+    """Swap the per-station documents in as db_name.collection_name (see mongo_loader)"""
+    return load_passengers(client, db_name, collection_name,
+                           report.station_documents(train_number, journey_date),
+                           batch_size=64, writers=1, indexes=VACANCY_INDEXES)
+
+
+def main(argv=None):
+    from passenger_generator import DEFAULT_SEED, generate
+
+    parser = argparse.ArgumentParser(description="Per-station vacant berth segments of a generated manifest")
+    parser.add_argument("--algorithm", default="correct")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", default="vacancies.npz", help=".npz blob ('' to skip)")
+    parser.add_argument("--mongo", action="store_true", help="also load one document per station into MongoDB")
+    parser.add_argument("--uri", default=DEFAULT_URI)
+    parser.add_argument("--db", default="PassengersDB")
+    parser.add_argument("--collection", default="P_1_vacancies")
+    args = parser.parse_args(argv)
+
+    manifest = generate({"algorithm": args.algorithm}, args.seed)
+    report = VacancyReport(manifest.occupancy())
+    counts = report.counts()
+    print(f"📊 {len(report)} vacant ranges; vacant berths per station: min {counts[:-1].min()}, "
+          f"max {counts[:-1].max()}")
+    if args.output:
+        report.write_blob(args.output)
+        print(f"✅ Exported: {args.output}")
+    if args.mongo:
+        client = MongoClient(args.uri, serverSelectionTimeoutMS=2000)
+        stats = export_to_mongo(client, args.db, args.collection, report,
+                                manifest.config["train_number"], manifest.config["journey_date"])
+        print(f"✅ MongoDB: {args.db}.{args.collection} ({stats['inserted']} docs)")
+
+
+if __name__ == "__main__":
+    main()